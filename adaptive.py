@@ -0,0 +1,65 @@
+"""
+Working-resolution control for the live view.
+
+With a target frame rate set, each live frame is filtered at the working
+scale chosen by AdaptiveScaler from recent filter latencies, and the
+display scales the result back up to the canvas. Window-sized parameters
+are rescaled with the frame (FilterProcessor.apply_filter's `scale`), so
+the result looks the same at every working resolution.
+"""
+import statistics
+import threading
+from collections import deque
+
+# Working resolutions, as fractions of the camera resolution
+SCALES = (1.0, 0.75, 0.5, 0.35, 0.25)
+
+# Frame rates offered by the live view's 🎯 Target FPS menu
+TARGET_FPS_CHOICES = (10, 15, 24, 30)
+
+
+class AdaptiveScaler:
+    """
+    Steps the working scale down when filtering misses the frame budget and
+    back up when there is headroom.
+
+    `update()` takes the filter latency of one frame, from any thread. Once
+    `window` frames were measured at the current scale, their median is
+    compared with the budget (1 / target_fps): above it the scale drops one
+    step; if the next larger scale is predicted to fit within `headroom` of
+    the budget (latency grows with the pixel count), it goes back up. The
+    headroom keeps the scale from oscillating between two steps.
+    """
+
+    def __init__(self, target_fps, scales=SCALES, window=5, headroom=0.7):
+        self.budget = 1.0 / target_fps
+        self.scales = scales
+        self.window = window
+        self.headroom = headroom
+        self._index = 0
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def scale(self):
+        return self.scales[self._index]
+
+    def update(self, latency, scale):
+        """Record the latency of a frame filtered at `scale`."""
+        with self._lock:
+            # Frames already in flight when the scale changed don't count
+            if scale != self.scale:
+                return
+            self._latencies.append(latency)
+            if len(self._latencies) < self.window:
+                return
+            median = statistics.median(self._latencies)
+            index = self._index
+            if median > self.budget and index < len(self.scales) - 1:
+                self._index += 1
+            elif index > 0:
+                larger = self.scales[index - 1]
+                if median * (larger / self.scales[index]) ** 2 < self.budget * self.headroom:
+                    self._index -= 1
+            if self._index != index:
+                self._latencies.clear()
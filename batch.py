@@ -0,0 +1,263 @@
+"""
+Headless batch processing: apply one filter to every image in a directory.
+
+Usage:
+    python main.py batch --filter glpf --param glpf_radius=40 in/ out/
+    python batch.py --filter canny --param canny_low_ratio=50 in/ out/
+    python batch.py --filter median,ghpf,canny in/ out/    # filter chain
+    python batch.py --filter median --stream in/ out/      # huge .npy/.raw/.tif rasters
+
+Files are fanned out across a process pool in chunks, results are written
+as soon as each image is done, and unreadable or corrupt files are reported
+without stopping the batch. With --stream, rasters are instead filtered one
+at a time in memory-mapped row strips (see streaming.py).
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import cv2
+
+from filters import (CHAIN_MODE, COLOR_MODES, DEFAULT_PARAMS, FILTER_MODES, FILTERS, MORPH_MAX_KERNEL,
+                     FilterProcessor)
+from streaming import STREAM_EXTENSIONS, stream_filter
+from tiling import TiledExecutor
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+# One processor per worker process, created by _init_worker
+_processor = None
+
+
+# ParamSpec of every parameter, for validating --param against the GUI ranges
+PARAM_SPECS = {param.key: param for spec in FILTERS.values() for param in spec.params}
+# ...except the order filter windows, which may go past the GUI sliders
+for _key in ('min_kernel', 'max_kernel', 'midpoint_kernel'):
+    PARAM_SPECS[_key] = PARAM_SPECS[_key]._replace(max=MORPH_MAX_KERNEL)
+
+
+def parse_param(text):
+    """Parse a `name=value` override, using the default's type and the registry's range."""
+    name, sep, value = text.partition('=')
+    if not sep or name not in DEFAULT_PARAMS:
+        raise argparse.ArgumentTypeError(f"expected name=value with a known parameter, got '{text}'")
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid value for {name}: '{value}'")
+    kind = type(DEFAULT_PARAMS[name])
+    if kind is int and not number.is_integer():
+        raise argparse.ArgumentTypeError(f"{name} must be an integer, got '{value}'")
+    number = kind(number)
+    spec = PARAM_SPECS.get(name)
+    if spec is not None and not spec.min <= number <= spec.max:
+        raise argparse.ArgumentTypeError(f"{name} must be between {spec.min} and {spec.max}, got {number}")
+    # Same rule as the GUI controls: kernel sizes are odd
+    if 'kernel' in name and number % 2 == 0:
+        raise argparse.ArgumentTypeError(f"{name} must be odd, got {number}")
+    return name, number
+
+
+def parse_shape(text):
+    """Parse ROWSxCOLS[xCHANNELS] for headerless .raw inputs."""
+    try:
+        shape = tuple(int(n) for n in text.lower().split('x'))
+    except ValueError:
+        shape = ()
+    if len(shape) not in (2, 3) or min(shape) <= 0:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS or ROWSxCOLSxCHANNELS, got '{text}'")
+    return shape
+
+
+def iter_jobs(input_dir, output_dir, extensions=IMAGE_EXTENSIONS):
+    """Yield (source, destination) pairs, mirroring the input directory tree."""
+    for root, _, files in os.walk(input_dir):
+        out_root = os.path.join(output_dir, os.path.relpath(root, input_dir))
+        for name in sorted(files):
+            if name.lower().endswith(extensions):
+                os.makedirs(out_root, exist_ok=True)
+                yield os.path.join(root, name), os.path.join(out_root, name)
+
+
+def iter_chunks(jobs, chunk_size):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def parse_filters(text):
+    """Parse one mode or a comma-separated chain of modes."""
+    modes = [mode.strip() for mode in text.split(',') if mode.strip()]
+    unknown = [mode for mode in modes if mode not in FILTER_MODES]
+    if not modes or unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown filter(s) {', '.join(unknown) or text!r}; choose from {', '.join(FILTER_MODES)}")
+    return modes
+
+
+def make_processor(modes, params, color_mode='gray'):
+    """FilterProcessor running one mode, or a chain of several."""
+    if len(modes) == 1:
+        processor = FilterProcessor(params, modes[0])
+    else:
+        processor = FilterProcessor(params, CHAIN_MODE)
+        for mode in modes:
+            processor.chain.add(mode, processor.params)
+    processor.color_mode = color_mode
+    # A failing filter must fail the job, not write the unfiltered image
+    processor.strict = True
+    return processor
+
+
+def _init_worker(modes, params, tile_workers=0, color_mode='gray'):
+    global _processor
+    # Parallelism comes from the process pool (and tile threads); keep OpenCV
+    # from oversubscribing
+    cv2.setNumThreads(1)
+    _processor = make_processor(modes, params, color_mode)
+    if tile_workers:
+        _processor.tiler = TiledExecutor(tile_workers)
+
+
+def _process_chunk(jobs):
+    """Filter and write every image of a chunk; returns (source, error or None) pairs."""
+    results = []
+    for src, dst in jobs:
+        try:
+            img = cv2.imread(src)
+            if img is None:
+                raise ValueError("unreadable or corrupt image")
+            if not cv2.imwrite(dst, _processor.apply_filter(img)):
+                raise ValueError("could not write output")
+            results.append((src, None))
+        except Exception as e:
+            results.append((src, str(e)))
+    return results
+
+
+def run_batch(input_dir, output_dir, modes, params, workers=None, chunk_size=8, tile_workers=0,
+              color_mode='gray'):
+    """
+    Process a directory tree with one filter or a chain of filters.
+
+    With tile_workers, each worker process also splits large images (8 MP
+    and up) into tiles filtered on that many threads; useful for a few huge
+    scans with a small number of worker processes. color_mode is one of
+    filters.COLOR_MODES.
+
+    Returns (processed, failed, elapsed seconds).
+    """
+    workers = workers or os.cpu_count() or 1
+    processed, failed = 0, []
+    start = time.perf_counter()
+
+    def collect(futures):
+        nonlocal processed
+        for future in futures:
+            for src, error in future.result():
+                if error is None:
+                    processed += 1
+                else:
+                    failed.append(src)
+                    print(f"FAILED {src}: {error}", file=sys.stderr)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(modes, params, tile_workers, color_mode)) as pool:
+        # Keep a bounded number of chunks in flight so huge directories
+        # don't queue every task up front
+        pending = set()
+        for chunk in iter_chunks(iter_jobs(input_dir, output_dir), chunk_size):
+            pending.add(pool.submit(_process_chunk, chunk))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        collect(wait(pending)[0])
+
+    return processed, failed, time.perf_counter() - start
+
+
+def run_stream(input_dir, output_dir, modes, params, workers=None, strip_rows=256, raw_shape=None):
+    """
+    Stream every raster in a directory tree through the filter in row strips.
+
+    Files are processed one at a time; `workers` threads filter the strips.
+    Returns (processed, failed, elapsed seconds).
+    """
+    processor = make_processor(modes, params)
+    processed, failed = 0, []
+    start = time.perf_counter()
+    for src, dst in iter_jobs(input_dir, output_dir, STREAM_EXTENSIONS):
+        try:
+            stream_filter(processor, src, dst, strip_rows, workers, raw_shape)
+            processed += 1
+        except Exception as e:
+            failed.append(src)
+            print(f"FAILED {src}: {e}", file=sys.stderr)
+    return processed, failed, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='main.py batch',
+                                     description="Apply a filter to every image in a directory.")
+    parser.add_argument('input_dir')
+    parser.add_argument('output_dir')
+    parser.add_argument('--filter', required=True, type=parse_filters, metavar='MODE[,MODE...]',
+                        help="filter mode, or a comma-separated chain applied in order")
+    parser.add_argument('--param', action='append', type=parse_param, default=[],
+                        metavar='NAME=VALUE', help="override a filter parameter (repeatable)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=8,
+                        help="images per submitted task")
+    parser.add_argument('--color', choices=COLOR_MODES, default='gray',
+                        help="mean, order and frequency filters: grayscale, every BGR channel, "
+                             "or luma only (ycrcb)")
+    parser.add_argument('--tile-workers', type=int, default=0,
+                        help="threads per worker process for tiling large images (default: off)")
+    parser.add_argument('--stream', action='store_true',
+                        help=f"filter {'/'.join(STREAM_EXTENSIONS)} rasters in memory-mapped row strips; "
+                             "--workers then sets the strip threads")
+    parser.add_argument('--strip-rows', type=int, default=256,
+                        help="rows per strip in --stream mode")
+    parser.add_argument('--raw-shape', type=parse_shape, default=None, metavar='ROWSxCOLS[xCHANNELS]',
+                        help="shape of headerless .raw uint8 inputs in --stream mode")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.input_dir):
+        parser.error(f"not a directory: {args.input_dir}")
+
+    if args.stream:
+        whole = [mode for mode in args.filter if FILTERS[mode].halo is None]
+        if whole:
+            parser.error(f"--stream can't run {', '.join(whole)}: they need the whole image")
+        # A chain streams as one unit; stages normalized by the image's peak
+        # magnitude (two passes on their own) make it untileable
+        if len(args.filter) > 1 and make_processor(args.filter, dict(args.param)).chain.halo() is None:
+            peaked = [mode for mode in args.filter if FILTERS[mode].magnitude is not None]
+            parser.error(f"--stream can't run {', '.join(peaked)} in a chain: "
+                         "it is normalized by the whole image's peak")
+        if args.color != 'gray':
+            parser.error("--stream writes grayscale output; --color isn't supported")
+        processed, failed, elapsed = run_stream(args.input_dir, args.output_dir, args.filter,
+                                                dict(args.param), args.workers, args.strip_rows,
+                                                args.raw_shape)
+    else:
+        processed, failed, elapsed = run_batch(args.input_dir, args.output_dir, args.filter,
+                                               dict(args.param), args.workers, args.chunk_size,
+                                               args.tile_workers, args.color)
+
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    print(f"Processed {processed} images in {elapsed:.2f}s ({rate:.1f} images/sec), "
+          f"{len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Benchmark per-frame allocations of the live loop at 1080p.
+
+Simulates the live view for every filter: capture into a frame array,
+filter it, display, and drop the previous frame. Without a pool each
+capture and result is a new array; with pipeline.BufferPool (what the GUI
+uses while the camera runs) captures go into recycled buffers, results are
+written into pooled arrays and the previous frame is released. Reports the
+peak NumPy memory allocated per steady-state frame (tracemalloc; OpenCV's
+internal temporaries are not counted) and the time per frame.
+
+Usage:
+    python benchmarks/bench_buffers.py [--frames N]
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from common import make_app, synthetic_frame
+from filters import FILTERS
+from pipeline import BufferPool
+
+
+def live_loop(app, sources, frames, pool=None):
+    """Run `frames` capture/filter/release cycles; returns (peak bytes per frame, seconds per frame)."""
+    app.output_pool = pool
+    previous = ()
+
+    def cycle(i):
+        nonlocal previous
+        source = sources[i % len(sources)]
+        # Stands in for cap.read(), which decodes into the array it is given
+        frame = pool.acquire(source.shape) if pool else np.empty_like(source)
+        np.copyto(frame, source)
+        result = app.apply_filter(frame)
+        if pool:
+            for buf in previous:
+                if buf is not frame and buf is not result:
+                    pool.release(buf)
+        previous = (frame, result)
+
+    # Warm up scratch buffers, masks and the pool
+    for i in range(3):
+        cycle(i)
+
+    peaks = []
+    start = time.perf_counter()
+    tracemalloc.start()
+    for i in range(frames):
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        cycle(i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return float(np.median(peaks)), (time.perf_counter() - start) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=20)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    sources = [synthetic_frame(args.width, args.height, seed=i) for i in range(3)]
+    print(f"{args.width}x{args.height}, median of {args.frames} frames (time includes tracemalloc overhead)")
+    print(f"{'filter':>12} {'alloc MB':>9} {'pooled MB':>10} {'ms':>7} {'pooled ms':>10}")
+    for mode in FILTERS:
+        app = make_app()
+        app.current_mode = mode
+        plain, plain_time = live_loop(app, sources, args.frames)
+        pooled, pooled_time = live_loop(app, sources, args.frames, BufferPool())
+        print(f"{mode:>12} {plain / 2 ** 20:>9.2f} {pooled / 2 ** 20:>10.2f} "
+              f"{plain_time * 1000:>7.1f} {pooled_time * 1000:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
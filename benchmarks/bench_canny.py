@@ -0,0 +1,28 @@
+"""
+Benchmark for the Canny edge detector at common camera resolutions.
+
+Usage:
+    python benchmarks/bench_canny.py [--repeat N]
+"""
+import argparse
+
+from common import make_app, synthetic_frame, time_call
+
+RESOLUTIONS = [(320, 240), (640, 480), (1280, 720)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    print(f"{'resolution':>12} {'median ms':>10} {'fps':>8}")
+    for width, height in RESOLUTIONS:
+        frame = synthetic_frame(width, height)
+        median = time_call(lambda: app.Canny_edge_detection(frame, 3), args.repeat)
+        print(f"{width:>5}x{height:<6} {median * 1000:>10.2f} {1 / median:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
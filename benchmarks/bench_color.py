@@ -0,0 +1,45 @@
+"""
+Benchmark the color modes of the mean, order and frequency filters at 1080p.
+
+Times every color-aware filter in grayscale, per BGR channel (three
+channels on a thread pool) and luma-only (YCrCb) mode, relative to the
+grayscale path. Per-channel scaling depends on the core count; luma-only
+adds two color conversions to the grayscale cost.
+
+Usage:
+    python benchmarks/bench_color.py [--repeat N]
+"""
+import argparse
+import os
+
+from common import make_app, synthetic_frame, time_call
+from filters import FILTERS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    frame = synthetic_frame(args.width, args.height)
+    app = make_app()
+
+    print(f"{args.width}x{args.height}, {os.cpu_count()} CPUs")
+    print(f"{'filter':>12} {'gray ms':>8} {'bgr ms':>8} {'ycrcb ms':>9} {'bgr/gray':>9} {'ycrcb/gray':>11}")
+    for mode, spec in FILTERS.items():
+        if not spec.color:
+            continue
+        app.current_mode = mode
+        times = {}
+        for color_mode in ('gray', 'bgr', 'ycrcb'):
+            app.color_mode = color_mode
+            times[color_mode] = time_call(lambda: app.apply_filter(frame), args.repeat)
+        gray = times['gray']
+        print(f"{mode:>12} {gray * 1000:>8.2f} {times['bgr'] * 1000:>8.2f} {times['ycrcb'] * 1000:>9.2f} "
+              f"{times['bgr'] / gray:>8.2f}x {times['ycrcb'] / gray:>10.2f}x")
+
+
+if __name__ == '__main__':
+    main()
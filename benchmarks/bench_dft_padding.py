@@ -0,0 +1,48 @@
+"""
+Benchmark DFT_and_reconstruct with and without optimal-size padding.
+
+Runs a Gaussian low-pass over a matrix of common and odd camera
+resolutions and compares the padded (cv2.getOptimalDFTSize) path against
+transforming the frame at its native size.
+
+Usage:
+    python benchmarks/bench_dft_padding.py [--repeat N]
+"""
+import argparse
+
+import cv2
+
+from common import make_app, synthetic_frame, time_call
+
+RESOLUTIONS = [
+    (640, 480), (641, 481), (800, 600), (1024, 768), (1023, 767),
+    (1280, 720), (1280, 722), (1366, 768), (1920, 1080), (1919, 1079),
+    (2592, 1944), (3840, 2160), (3839, 2161),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--radius', type=int, default=30)
+    args = parser.parse_args()
+
+    app = make_app()
+    cache = app.mask_cache
+    print(f"{'resolution':>12} {'dft size':>12} {'native ms':>10} {'padded ms':>10} {'speedup':>8}")
+    for width, height in RESOLUTIONS:
+        gray = cv2.cvtColor(synthetic_frame(width, height), cv2.COLOR_BGR2GRAY)
+        padded_shape = cache.dft_shape(gray.shape)
+
+        native_mask = cache.get(gray.shape, 'glpf', args.radius)
+        padded_mask = cache.get(padded_shape, 'glpf', args.radius)
+        native = time_call(lambda: app.DFT_and_reconstruct(gray, native_mask, pad=False), args.repeat)
+        padded = time_call(lambda: app.DFT_and_reconstruct(gray, padded_mask, pad=True), args.repeat)
+
+        size = f"{padded_shape[1]}x{padded_shape[0]}"
+        print(f"{width:>5}x{height:<6} {size:>12} {native * 1000:>10.2f} {padded * 1000:>10.2f} "
+              f"{native / padded:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark the display path (update_canvas) at 1080p.
+
+Compares the former per-frame path (single-channel results expanded with
+GRAY2BGR before resizing, BGR->RGB, a new PIL image and ImageTk.PhotoImage
+every frame, canvas item deleted and recreated) with display.CanvasView,
+which resizes single-channel data first and pastes into one persistent
+PhotoImage and canvas item.
+
+The full comparison needs a Tk display. Without one, only the CPU-side
+preparation (resize and conversion to a PIL image) is measured.
+
+Usage:
+    python benchmarks/bench_display.py [--repeat N] [--canvas WxH]
+"""
+import argparse
+import tkinter as tk
+
+import cv2
+from PIL import Image, ImageTk
+
+from common import synthetic_frame, time_call
+from display import CanvasView
+from profiling import StageProfiler
+
+
+def legacy_prepare(frame, size):
+    if frame.ndim == 2:
+        frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+    resized = cv2.resize(frame, size)
+    return Image.fromarray(cv2.cvtColor(resized, cv2.COLOR_BGR2RGB))
+
+
+def legacy_show(canvas, frame, width, height):
+    fh, fw = frame.shape[:2]
+    scale = min(width / fw, height / fh) * 0.95
+    nw, nh = int(fw * scale), int(fh * scale)
+    photo = ImageTk.PhotoImage(image=legacy_prepare(frame, (nw, nh)))
+    canvas.delete('all')
+    canvas.create_image((width - nw) // 2, (height - nh) // 2, anchor='nw', image=photo)
+    canvas.image = photo
+    # Include Tk's own redraw, as the live view pays it too
+    canvas.update_idletasks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    parser.add_argument('--canvas', default='1200x760', help="canvas size WxH")
+    args = parser.parse_args()
+
+    cw, ch = (int(v) for v in args.canvas.split('x'))
+    color = synthetic_frame(args.width, args.height)
+    frames = {'gray': cv2.cvtColor(color, cv2.COLOR_BGR2GRAY), 'color': color}
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        root = None
+        print(f"No Tk display ({e}); measuring preparation only")
+
+    print(f"{args.width}x{args.height} frame on a {cw}x{ch} canvas")
+    if root is None:
+        view = CanvasView(None, profiler=StageProfiler())
+        print(f"{'frame':>6} {'legacy prep ms':>15} {'new prep ms':>12} {'speedup':>8}")
+        for name, frame in frames.items():
+            nw, nh, _, _ = view.fit(frame.shape, cw, ch)
+            old = time_call(lambda: legacy_prepare(frame, (nw, nh)), args.repeat)
+            new = time_call(lambda: view.prepare(frame, (nw, nh)), args.repeat)
+            print(f"{name:>6} {old * 1000:>15.2f} {new * 1000:>12.2f} {old / new:>7.2f}x")
+        return
+
+    root.geometry(f"{cw}x{ch}")
+    canvas = tk.Canvas(root, width=cw, height=ch, highlightthickness=0)
+    canvas.pack(fill='both', expand=True)
+    root.update()
+    cw, ch = canvas.winfo_width(), canvas.winfo_height()
+    view = CanvasView(canvas, profiler=StageProfiler())
+
+    def show(frame):
+        view.show(frame)
+        canvas.update_idletasks()
+
+    print(f"{'frame':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for name, frame in frames.items():
+        old = time_call(lambda: legacy_show(canvas, frame, cw, ch), args.repeat)
+        canvas.delete('all')
+        view = CanvasView(canvas, profiler=StageProfiler())
+        new = time_call(lambda: show(frame), args.repeat)
+        print(f"{name:>6} {old * 1000:>10.2f} {new * 1000:>8.2f} {old / new:>7.2f}x")
+    root.destroy()
+
+
+if __name__ == '__main__':
+    main()
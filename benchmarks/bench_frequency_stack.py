@@ -0,0 +1,87 @@
+"""
+Benchmark frequency filtering of a stack of same-sized frames.
+
+Compares filtering each frame with apply_filter, FilterProcessor.filter_stack
+at several chunk sizes, and one batched np.fft.rfft2 / irfft2 call per chunk
+with a broadcast mask (reproduced here; it is slower than per-frame cv2.dft,
+which is why filter_stack doesn't use it). Reports ms per frame and the peak
+NumPy allocation (tracemalloc), including filter_stack's buffers, which grow
+with the chunk size.
+
+Usage:
+    python benchmarks/bench_frequency_stack.py [--frames N] [--kind glpf] [--radius 30]
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+from common import make_app, peak_memory, synthetic_frame, time_call
+from filters import FilterMaskCache
+
+CHUNK_SIZES = [1, 4, 8, 16]
+
+
+def rfft_mask(shape, kind, radius, order=None):
+    """Transfer function laid out like np.fft.rfft2 output (rows, cols // 2 + 1)."""
+    rows, cols = shape
+    y = np.minimum(np.arange(rows), rows - np.arange(rows))[:, None]
+    x = np.arange(cols // 2 + 1)[None, :]
+    return FilterMaskCache.build(kind, (x ** 2 + y ** 2).astype(np.float32), radius, order)
+
+
+def numpy_stack(stack, mask, chunk_size):
+    """Batched rfft2 over each chunk, one broadcast mask, per-frame peak normalization."""
+    out = np.empty(stack.shape, np.uint8)
+    rows, cols = stack.shape[1:]
+    for start in range(0, len(stack), chunk_size):
+        chunk = stack[start:start + chunk_size].astype(np.float32)
+        spectra = np.fft.rfft2(chunk)
+        spectra *= mask
+        back = np.abs(np.fft.irfft2(spectra, s=(rows, cols)))
+        peaks = back.max(axis=(1, 2), keepdims=True)
+        out[start:start + chunk_size] = back * (255 / np.where(peaks > 0, peaks, 1))
+    return out
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=32)
+    parser.add_argument('--width', type=int, default=1280)
+    parser.add_argument('--height', type=int, default=720)
+    parser.add_argument('--kind', default='glpf', choices=['ilpf', 'glpf', 'blpf', 'ihpf', 'ghpf', 'bhpf'])
+    parser.add_argument('--radius', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    order = 2 if args.kind in ('blpf', 'bhpf') else None
+    app = make_app(**{f'{args.kind}_radius': args.radius, f'{args.kind}_order': order or 2})
+    app.current_mode = args.kind
+    stack = np.stack([cv2.cvtColor(synthetic_frame(args.width, args.height, seed=i), cv2.COLOR_BGR2GRAY)
+                      for i in range(args.frames)])
+    expected = np.stack([app.apply_filter(frame) for frame in stack])
+
+    def report(name, func, cold=None):
+        """Time func(); measure memory on `cold` (a fresh processor) if given, so buffers count."""
+        seconds = time_call(func, args.repeat)
+        memory = peak_memory(cold or func) / 2 ** 20
+        print(f"{name:>26} {seconds * 1000 / args.frames:>9.2f} {memory:>8.1f}")
+        return seconds
+
+    print(f"{args.frames} frames of {args.width}x{args.height}, {args.kind} r={args.radius}")
+    print(f"{'':>26} {'ms/frame':>9} {'peak MB':>8}")
+    base = report("apply_filter per frame", lambda: [app.apply_filter(frame) for frame in stack])
+    for chunk in CHUNK_SIZES:
+        seconds = report(f"filter_stack chunk={chunk}",
+                         lambda: app.filter_stack(stack, args.kind, args.radius, order, chunk),
+                         lambda: make_app().filter_stack(stack, args.kind, args.radius, order, chunk))
+        same = np.array_equal(app.filter_stack(stack, args.kind, args.radius, order, chunk), expected)
+        print(f"{'':>26} {base / seconds:>8.2f}x identical={same}")
+
+    mask = rfft_mask(stack.shape[1:], args.kind, args.radius, order)
+    for chunk in CHUNK_SIZES[1:]:
+        report(f"np.fft.rfft2 chunk={chunk}", lambda: numpy_stack(stack, mask, chunk))
+
+
+if __name__ == '__main__':
+    main()
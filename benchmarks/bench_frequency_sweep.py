@@ -0,0 +1,70 @@
+"""
+Benchmark a frequency-filter radius sweep on a 4K image.
+
+Drags the cutoff radius through 1..200 the way the GUI slider does and
+compares recomputing the forward DFT at every step against holding it in
+the image's ImageContext, where each step only builds the mask, applies
+it and runs the inverse transform. Results are not memoized between
+steps (every radius is new), so the timings are per-step filter cost.
+
+Usage:
+    python benchmarks/bench_frequency_sweep.py [--kind glpf] [--max-radius 200] [--step 1]
+"""
+import argparse
+import time
+
+import cv2
+
+from common import make_app, synthetic_frame, time_call
+from filters import ImageContext
+
+
+def sweep(app, frame, kind, radii, context=None):
+    """Total seconds to filter frame once per radius."""
+    app.current_mode = kind
+    app.mask_cache = type(app.mask_cache)()
+    start = time.perf_counter()
+    for radius in radii:
+        app.params[f'{kind}_radius'] = radius
+        app.apply_filter(frame, context)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--kind', default='glpf', choices=['ilpf', 'glpf', 'blpf', 'ihpf', 'ghpf', 'bhpf'])
+    parser.add_argument('--width', type=int, default=3840)
+    parser.add_argument('--height', type=int, default=2160)
+    parser.add_argument('--max-radius', type=int, default=200)
+    parser.add_argument('--step', type=int, default=1)
+    args = parser.parse_args()
+
+    app = make_app()
+    frame = synthetic_frame(args.width, args.height)
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    radii = range(1, args.max_radius + 1, args.step)
+
+    # Per-stage cost of one step (median of a few runs)
+    shape = app.mask_cache.dft_shape(gray.shape)
+    order = app.params.get(f'{args.kind}_order')
+    d2 = app.mask_cache.distance(shape)
+    forward = time_call(lambda: app.forward_dft(gray), 5)
+    dft = app.forward_dft(gray)
+    build = time_call(lambda: app.mask_cache.build(args.kind, d2, 30, order), 5)
+    mask = app.mask_cache.get(shape, args.kind, 30, order)
+    inverse = time_call(lambda: app.inverse_dft(app.apply_mask(dft, mask), gray.shape), 5)
+
+    print(f"{args.width}x{args.height} {args.kind.upper()}, DFT size {shape[1]}x{shape[0]}, "
+          f"radius 1..{args.max_radius} step {args.step} ({len(radii)} steps)")
+    print(f"  forward DFT {forward * 1000:.1f} ms | mask build {build * 1000:.1f} ms | "
+          f"mask + inverse {inverse * 1000:.1f} ms")
+
+    full = sweep(app, frame, args.kind, radii)
+    held = sweep(app, frame, args.kind, radii, ImageContext(frame))
+    print(f"{'':>16} {'total s':>8} {'ms/step':>8}")
+    print(f"{'forward per step':>16} {full:>8.2f} {full / len(radii) * 1000:>8.1f}")
+    print(f"{'held spectrum':>16} {held:>8.2f} {held / len(radii) * 1000:>8.1f}   ({full / held:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark the gradient magnitude filter against the former float64 path.
+
+The legacy path converts with skimage's rgb2gray once per derivative and
+works on float64, as the notebook did. It is only timed when scikit-image
+is installed; the report also shows the largest per-pixel difference.
+
+Usage:
+    python benchmarks/bench_gradient.py [--repeat N]
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+from common import make_app, synthetic_frame, time_call
+
+RESOLUTIONS = [(640, 480), (1280, 720), (1920, 1080)]
+KERNELS = [3, 7]
+
+
+def legacy_gradient(frame, ksize):
+    from skimage.color import rgb2gray
+    sobelx = cv2.Sobel(rgb2gray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)), cv2.CV_64F, 1, 0, ksize=ksize)
+    sobely = cv2.Sobel(rgb2gray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)), cv2.CV_64F, 0, 1, ksize=ksize)
+    magnitude = np.sqrt(sobelx ** 2 + sobely ** 2)
+    magnitude *= 255.0 / magnitude.max()
+    return magnitude.astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    try:
+        import skimage  # noqa: F401
+        has_legacy = True
+    except ImportError:
+        has_legacy = False
+        print("scikit-image not installed: legacy path skipped")
+
+    app = make_app()
+    print(f"{'resolution':>12} {'ksize':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8} {'max diff':>9}")
+    for width, height in RESOLUTIONS:
+        frame = synthetic_frame(width, height)
+        for ksize in KERNELS:
+            new = time_call(lambda: app.gradient_func(frame, ksize), args.repeat)
+            if has_legacy:
+                legacy = time_call(lambda: legacy_gradient(frame, ksize), args.repeat)
+                diff = np.abs(legacy_gradient(frame, ksize).astype(int) - app.gradient_func(frame, ksize)).max()
+                print(f"{width:>5}x{height:<6} {ksize:>6} {legacy * 1000:>10.2f} {new * 1000:>8.2f} "
+                      f"{legacy / new:>7.2f}x {diff:>9}")
+            else:
+                print(f"{width:>5}x{height:<6} {ksize:>6} {'-':>10} {new * 1000:>8.2f} {'-':>8} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
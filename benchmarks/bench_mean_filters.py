@@ -0,0 +1,75 @@
+"""
+Benchmark the mean filters across kernel sizes at 1080p.
+
+Compares the box-sum implementations against the former cv2.filter2D
+versions with dense k x k kernels, which are reproduced here. The box-sum
+cost should stay flat as k grows.
+
+Usage:
+    python benchmarks/bench_mean_filters.py [--repeat N]
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+from common import make_app, synthetic_frame, time_call
+
+KERNELS = [3, 5, 7, 9, 11, 15, 21, 25, 31]
+Q = 1.5
+
+
+def legacy_arithmetic(gray, ksize):
+    kernel = np.ones((ksize, ksize), np.float32) / (ksize * ksize)
+    return cv2.filter2D(gray, -1, kernel)
+
+
+def legacy_geometric(gray, ksize):
+    log_img = np.log(gray.astype(np.float32) + 1)
+    kernel = np.ones((ksize, ksize), np.float32) / (ksize * ksize)
+    return np.clip(np.exp(cv2.filter2D(log_img, -1, kernel)), 0, 255).astype(np.uint8)
+
+
+def legacy_harmonic(gray, ksize):
+    inv = 1.0 / (gray.astype(np.float32) + 1)
+    h_mean = ksize * ksize / cv2.filter2D(inv, -1, np.ones((ksize, ksize), np.float32))
+    return np.clip(h_mean, 0, 255).astype(np.uint8)
+
+
+def legacy_contraharmonic(gray, ksize):
+    gray = gray.astype(np.float32)
+    numerator = cv2.filter2D(np.power(gray, Q + 1), -1, np.ones((ksize, ksize)))
+    denominator = cv2.filter2D(np.power(gray, Q), -1, np.ones((ksize, ksize))) + 1e-9
+    return np.clip(numerator / denominator, 0, 255).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    app = make_app()
+    gray = cv2.cvtColor(synthetic_frame(args.width, args.height), cv2.COLOR_BGR2GRAY)
+    filters = [
+        ("arithmetic", legacy_arithmetic, app.arithmetic_mean_filter),
+        ("geometric", legacy_geometric, app.geometric_mean_filter),
+        ("harmonic", legacy_harmonic, app.harmonic_mean_filter),
+        ("contraharmonic", lambda g, k: legacy_contraharmonic(g, k),
+         lambda g, k: app.contraharmonic_mean_filter(g, k, Q)),
+    ]
+
+    print(f"{args.width}x{args.height}, Q={Q} for contraharmonic")
+    print(f"{'filter':>15} {'k':>3} {'filter2D ms':>12} {'box ms':>8} {'speedup':>8} {'max diff':>9}")
+    for name, legacy, current in filters:
+        for ksize in KERNELS:
+            old = time_call(lambda: legacy(gray, ksize), args.repeat)
+            new = time_call(lambda: current(gray, ksize), args.repeat)
+            diff = np.abs(legacy(gray, ksize).astype(int) - current(gray, ksize)).max()
+            print(f"{name:>15} {ksize:>3} {old * 1000:>12.2f} {new * 1000:>8.2f} "
+                  f"{old / new:>7.2f}x {diff:>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Benchmark the min, max and midpoint filters across kernel sizes at 1080p.
+
+Compares the current implementations against the former dense-kernel
+erode/dilate versions (midpoint with int16 arithmetic), reproduced here.
+Kernels from MORPH_TABLE_MIN_KERNEL up switch to the log-time running
+extreme, so the cost stays nearly flat well past the GUI limit of 31.
+
+Usage:
+    python benchmarks/bench_order_filters.py [--repeat N]
+"""
+import argparse
+
+import cv2
+import numpy as np
+
+from common import make_app, synthetic_frame, time_call
+from filters import MORPH_TABLE_MIN_KERNEL
+
+KERNELS = [3, 7, 15, 31, 63, 127, 255]
+
+
+def legacy_min(gray, ksize):
+    return cv2.erode(gray, np.ones((ksize, ksize), np.uint8))
+
+
+def legacy_max(gray, ksize):
+    return cv2.dilate(gray, np.ones((ksize, ksize), np.uint8))
+
+
+def legacy_midpoint(gray, ksize):
+    kernel = np.ones((ksize, ksize), np.uint8)
+    min_f = cv2.erode(gray, kernel)
+    max_f = cv2.dilate(gray, kernel)
+    return ((min_f.astype(np.int16) + max_f.astype(np.int16)) // 2).astype(np.uint8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--width', type=int, default=1920)
+    parser.add_argument('--height', type=int, default=1080)
+    args = parser.parse_args()
+
+    app = make_app()
+    gray = cv2.cvtColor(synthetic_frame(args.width, args.height), cv2.COLOR_BGR2GRAY)
+    filters = [
+        ("min", legacy_min, app.min_filter),
+        ("max", legacy_max, app.max_filter),
+        ("midpoint", legacy_midpoint, app.midpoint_filter),
+    ]
+
+    print(f"{args.width}x{args.height}, running-extreme path from k={MORPH_TABLE_MIN_KERNEL}")
+    print(f"{'filter':>9} {'k':>4} {'legacy ms':>10} {'new ms':>8} {'speedup':>8} {'identical':>10}")
+    for name, legacy, current in filters:
+        for ksize in KERNELS:
+            old = time_call(lambda: legacy(gray, ksize), args.repeat)
+            new = time_call(lambda: current(gray, ksize), args.repeat)
+            same = np.array_equal(legacy(gray, ksize), current(gray, ksize))
+            print(f"{name:>9} {ksize:>4} {old * 1000:>10.2f} {new * 1000:>8.2f} "
+                  f"{old / new:>7.2f}x {str(same):>10}")
+
+
+if __name__ == '__main__':
+    main()
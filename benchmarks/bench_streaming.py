@@ -0,0 +1,95 @@
+"""
+Benchmark peak memory of strip streaming against loading a whole raster.
+
+Writes a synthetic BGR .npy raster to a temporary directory, then filters
+it in a fresh subprocess per configuration: once loaded fully into memory,
+and once streamed in memory-mapped row strips. Each subprocess reports its
+peak resident set size, so the numbers include OpenCV buffers. (VmHWM is
+used on Linux because ru_maxrss survives fork and exec, and the parent has
+just written the whole raster.)
+
+Usage:
+    python benchmarks/bench_streaming.py [--width W] [--height H] [--filter MODE]
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from common import make_app, synthetic_frame
+
+
+def peak_rss_kb():
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child(mode, path, filter_mode, strip_rows, workers):
+    """Run one configuration and print 'seconds peak_rss_kb'."""
+    from streaming import stream_filter
+
+    app = make_app()
+    app.current_mode = filter_mode
+    start = time.perf_counter()
+    if mode == 'load':
+        result = app.apply_filter(np.load(path))
+        np.save(path + '.out.npy', result)
+    else:
+        stream_filter(app, path, path + '.out.npy', strip_rows, workers)
+    elapsed = time.perf_counter() - start
+    print(elapsed, peak_rss_kb())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--width', type=int, default=12000)
+    parser.add_argument('--height', type=int, default=10000)
+    parser.add_argument('--filter', default='median')
+    parser.add_argument('--strip-rows', type=int, default=256)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'PATH'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(*args.child, args.filter, args.strip_rows, args.workers)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'raster.npy')
+        # Build the raster in 1000-row blocks so the parent stays small too
+        raster = np.lib.format.open_memmap(path, 'w+', np.uint8, (args.height, args.width, 3))
+        for top in range(0, args.height, 1000):
+            rows = min(1000, args.height - top)
+            raster[top:top + rows] = synthetic_frame(args.width, rows, seed=top)
+        del raster
+
+        size_mb = args.width * args.height * 3 / 2 ** 20
+        print(f"{args.width}x{args.height} BGR raster ({size_mb:.0f} MB), filter {args.filter}, "
+              f"{args.strip_rows}-row strips")
+        print(f"{'mode':>8} {'seconds':>8} {'peak RSS MB':>12}")
+        results = {}
+        for mode in ('load', 'stream'):
+            out = subprocess.run([sys.executable, __file__, '--child', mode, path,
+                                  '--filter', args.filter, '--strip-rows', str(args.strip_rows)]
+                                 + (['--workers', str(args.workers)] if args.workers else []),
+                                 capture_output=True, text=True, check=True)
+            elapsed, rss_kb = out.stdout.split()
+            print(f"{mode:>8} {float(elapsed):>8.2f} {int(rss_kb) / 1024:>12.1f}")
+            results[mode] = np.load(path + '.out.npy', mmap_mode='r')
+        print(f"identical output: {np.array_equal(results['load'], results['stream'])}")
+        del results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark every filter mode across resolutions and parameter ranges.
+
+Runs each FILTERS mode on synthetic frames at 480p, 720p, 1080p and 4K,
+first with the default parameters and then sweeping each parameter over
+its GUI range (min, middle, max, snapped to the slider step) with the
+others at their defaults. Frames go through apply_filter like live camera
+frames, so the mask cache is warm after the warm-up call and nothing is
+served from the result cache. Reports median and p95 latency and the peak
+NumPy allocation per call in MB (tracemalloc; OpenCV-internal buffers are
+not counted). This is bytes, not a count of allocations: tracemalloc only
+sees the memory that is live, and counting np.empty calls would miss the
+arrays that ufuncs and OpenCV allocate.
+
+--backend picks the implementation of the kernels OpenCV has no primitive
+for (kernels.py: Canny's suppression and hysteresis, the contraharmonic
+powers, the midpoint combine); compare a numpy and a numba run with
+--compare to see what compilation buys.
+
+Results can be saved as JSON and compared against an earlier run; the
+script exits with status 1 if any case got slower than the threshold.
+
+Usage:
+    python benchmarks/bench_suite.py [--modes glpf,median] [--resolutions 480p,1080p]
+                                     [--quick] [--repeat N] [--backend numba] [--save run.json]
+                                     [--baseline base.json] [--threshold 0.15]
+    python benchmarks/bench_suite.py --compare base.json run.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from common import make_app, peak_memory, synthetic_frame, time_samples
+from filters import DEFAULT_PARAMS, FILTERS
+from kernels import BACKEND_NAMES, get_backend
+
+RESOLUTIONS = {
+    '480p': (640, 480),
+    '720p': (1280, 720),
+    '1080p': (1920, 1080),
+    '4k': (3840, 2160),
+}
+
+
+def sweep_values(param):
+    """Min, middle and max of a parameter's GUI range, snapped to its step."""
+    middle = param.min + round((param.max - param.min) / 2 / param.step) * param.step
+    values = [param.min, middle, param.max]
+    if isinstance(param.step, float):
+        values = [round(v, 6) for v in values]
+    return sorted(set(values))
+
+
+def cases(modes, quick):
+    """Yield (case name, mode, params) for the defaults and each parameter sweep."""
+    for mode in modes:
+        spec = FILTERS[mode]
+        yield 'default', mode, dict(DEFAULT_PARAMS)
+        if quick:
+            continue
+        for param in spec.params:
+            for value in sweep_values(param):
+                if value == DEFAULT_PARAMS[param.key]:
+                    continue
+                yield f"{param.key}={value}", mode, dict(DEFAULT_PARAMS, **{param.key: value})
+
+
+def run_suite(modes, resolutions, repeat, quick, backend):
+    results = {}
+    for label in resolutions:
+        width, height = RESOLUTIONS[label]
+        frame = synthetic_frame(width, height)
+        for case, mode, params in cases(modes, quick):
+            app = make_app(**params)
+            app.current_mode = mode
+            app.backend = backend
+            times = np.array(time_samples(lambda: app.apply_filter(frame), repeat)) * 1000
+            alloc = peak_memory(lambda: app.apply_filter(frame)) / 2 ** 20
+            name = f"{mode}/{label}/{case}"
+            results[name] = {
+                'median_ms': round(float(np.median(times)), 4),
+                'p95_ms': round(float(np.percentile(times, 95)), 4),
+                'alloc_mb': round(alloc, 3),
+            }
+            print(f"{name:<44} {results[name]['median_ms']:>9.2f} "
+                  f"{results[name]['p95_ms']:>9.2f} {alloc:>9.1f}", flush=True)
+    return results
+
+
+def compare(baseline, current, threshold, min_ms):
+    """Print per-case changes in median latency; return the names of regressions."""
+    regressions = []
+    print(f"{'case':<44} {'base ms':>9} {'new ms':>9} {'change':>8}")
+    for name, new in current.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        before, after = old['median_ms'], new['median_ms']
+        change = after / before - 1 if before > 0 else 0.0
+        slower = change > threshold and after - before > min_ms
+        if slower:
+            regressions.append(name)
+        print(f"{name:<44} {before:>9.2f} {after:>9.2f} {change:>+7.1%}"
+              f"{'  REGRESSION' if slower else ''}")
+    return regressions
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', default=','.join(FILTERS),
+                        help="comma-separated filter modes (default: all)")
+    parser.add_argument('--resolutions', default=','.join(RESOLUTIONS),
+                        help=f"comma-separated subset of {', '.join(RESOLUTIONS)}")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--quick', action='store_true',
+                        help="default parameters only, no parameter sweep")
+    parser.add_argument('--backend', default='auto', choices=BACKEND_NAMES,
+                        help="kernel backend (default: numba if installed, else numpy)")
+    parser.add_argument('--save', metavar='FILE', help="write the results as JSON")
+    parser.add_argument('--baseline', metavar='FILE', help="compare against a saved run")
+    parser.add_argument('--compare', nargs=2, metavar=('BASE', 'NEW'),
+                        help="compare two saved runs without benchmarking")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="relative median slowdown that counts as a regression")
+    parser.add_argument('--min-ms', type=float, default=0.5,
+                        help="ignore slowdowns smaller than this many ms (timer noise)")
+    args = parser.parse_args()
+
+    if args.compare:
+        regressions = compare(load(args.compare[0]), load(args.compare[1]),
+                              args.threshold, args.min_ms)
+        print(f"{len(regressions)} regression(s)")
+        return 1 if regressions else 0
+
+    modes = args.modes.split(',')
+    resolutions = args.resolutions.split(',')
+    for mode in modes:
+        if mode not in FILTERS:
+            parser.error(f"unknown filter '{mode}'")
+    for label in resolutions:
+        if label not in RESOLUTIONS:
+            parser.error(f"unknown resolution '{label}'")
+    try:
+        backend = get_backend(args.backend)
+    except ValueError as e:
+        parser.error(str(e))
+
+    print(f"Kernel backend: {backend.name}")
+
+    print(f"{'case':<44} {'median ms':>9} {'p95 ms':>9} {'peak MB':>9}")
+    results = run_suite(modes, resolutions, args.repeat, args.quick, backend)
+
+    if args.save:
+        meta = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'opencv': cv2.__version__,
+            'machine': platform.machine(),
+            'repeat': args.repeat,
+            'backend': backend.name,
+        }
+        with open(args.save, 'w') as f:
+            json.dump({'meta': meta, 'results': results}, f, indent=1)
+        print(f"Saved {len(results)} results to {args.save}")
+
+    if args.baseline:
+        regressions = compare(load(args.baseline), results, args.threshold, args.min_ms)
+        print(f"{len(regressions)} regression(s)")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+"""Shared helpers for the benchmark scripts."""
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from filters import FilterProcessor  # noqa: E402
+
+
+def synthetic_frame(width, height, seed=0):
+    """Smoothed noise: gives edge and frequency filters realistic content."""
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (0, 0), 1.5)
+
+
+def make_app(**params):
+    """GUI-free filter host with default parameters plus overrides."""
+    return FilterProcessor(params)
+
+
+def time_samples(func, repeat):
+    """Wall times of `repeat` calls of func() in seconds, after one warm-up call."""
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def time_call(func, repeat):
+    """Median wall time of func() in seconds, after one warm-up call."""
+    return statistics.median(time_samples(func, repeat))
+
+
+def peak_memory(func):
+    """Peak traced allocation in bytes while func() runs."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
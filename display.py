@@ -0,0 +1,93 @@
+"""
+Frame display on a Tk canvas.
+
+The live view used to resize each frame, build a new PIL image and a new
+ImageTk.PhotoImage, and delete and recreate the canvas item, every frame.
+CanvasView keeps one PhotoImage and one canvas image item for as long as
+the displayed size and channel count stay the same, and pastes each new
+frame's pixels into that PhotoImage in place.
+"""
+import cv2
+from PIL import Image, ImageTk
+
+from profiling import StageProfiler
+
+
+class CanvasView:
+    """
+    One persistent PhotoImage and canvas item showing frames fitted to a canvas.
+
+    Frames are scaled to `margin` of the canvas, keeping their aspect ratio,
+    and centred. Single-channel filter results are resized and pasted as
+    grayscale ("L") images, so they are never expanded to three channels;
+    BGR frames are converted to RGB after resizing. An optional text overlay
+    is drawn on top of the image as a second persistent item. Stages are
+    timed on `profiler` (a disabled StageProfiler unless one is given).
+    """
+
+    def __init__(self, canvas, margin=0.95, profiler=None):
+        self.canvas = canvas
+        self.margin = margin
+        self.profiler = profiler if profiler is not None else StageProfiler()
+        self.photo = None
+        self._key = None
+        self._image_item = None
+        self._text_item = None
+
+    def fit(self, shape, width, height):
+        """Displayed (width, height) and top-left corner of a frame of `shape`."""
+        fh, fw = shape[:2]
+        scale = min(width / fw, height / fh) * self.margin
+        nw, nh = max(int(fw * scale), 1), max(int(fh * scale), 1)
+        return nw, nh, (width - nw) // 2, (height - nh) // 2
+
+    def prepare(self, frame, size):
+        """Resize a frame to `size` and return it as a PIL image, single-channel if possible."""
+        with self.profiler.stage('resize'):
+            resized = cv2.resize(frame, size) if size != (frame.shape[1], frame.shape[0]) else frame
+        with self.profiler.stage('convert'):
+            if resized.ndim == 3:
+                resized = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
+            return Image.fromarray(resized)
+
+    def show(self, frame):
+        """Display a frame; returns False if the canvas isn't laid out yet."""
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return False
+
+        nw, nh, x, y = self.fit(frame.shape, width, height)
+        img = self.prepare(frame, (nw, nh))
+
+        with self.profiler.stage('photo'):
+            key = (img.mode, img.size)
+            if key != self._key:
+                # Tk copies the pixels into its own buffer, so a new PhotoImage
+                # is only needed when the size or mode changes
+                self.photo = ImageTk.PhotoImage(img.mode, img.size)
+                self._key = key
+            self.photo.paste(img)
+
+        with self.profiler.stage('draw'):
+            if self._image_item is None:
+                self._image_item = self.canvas.create_image(x, y, anchor='nw', image=self.photo)
+            else:
+                self.canvas.itemconfig(self._image_item, image=self.photo)
+                self.canvas.coords(self._image_item, x, y)
+            if self._text_item is not None:
+                self.canvas.coords(self._text_item, x + 8, y + 8)
+                self.canvas.tag_raise(self._text_item)
+        return True
+
+    def set_overlay(self, text):
+        """Show `text` over the top-left corner of the image; empty text hides it."""
+        if self._text_item is None:
+            if not text:
+                return
+            self._text_item = self.canvas.create_text(8, 8, anchor='nw', fill='#00ff00',
+                                                      font=('Courier', 10, 'bold'))
+            if self._image_item is not None:
+                x, y = self.canvas.coords(self._image_item)
+                self.canvas.coords(self._text_item, x + 8, y + 8)
+        self.canvas.itemconfig(self._text_item, text=text, state='normal' if text else 'hidden')
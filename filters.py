@@ -0,0 +1,1274 @@
+import cv2
+import hashlib
+import numpy as np
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from kernels import get_backend
+from profiling import StageProfiler
+
+
+# Luma weights of skimage's rgb2gray (0.2125 R + 0.7154 G + 0.0721 B), in BGR
+# order and scaled so uint8 input maps to [0, 1]
+SOBEL_GRAY_WEIGHTS = np.array([[0.0721, 0.7154, 0.2125]], np.float32) / 255
+
+# How color-aware filters (FilterSpec.color) treat BGR frames: 'gray'
+# filters luminance and returns one channel, 'bgr' filters each channel,
+# 'ycrcb' filters luma (Y) only and keeps the chroma
+COLOR_MODES = ('gray', 'bgr', 'ycrcb')
+
+# Square min/max windows from this size up use the log-time running extreme
+# (_window_extreme) instead of cv2.erode/dilate, whose cost grows with k
+MORPH_TABLE_MIN_KERNEL = 97
+
+# Largest min/max/midpoint window batch and video runs accept; the GUI
+# sliders stop at 31, the running extreme keeps larger windows cheap
+MORPH_MAX_KERNEL = 255
+
+# ALL PARAMETERS FOR ALL FILTERS
+DEFAULT_PARAMS = {
+    # Edge Detection - Sobel
+    'sobel_kernel': 3,
+
+    # Canny Edge Detection
+    'canny_kernel': 3,
+    'canny_sigma': 0,
+    'canny_low_ratio': 30,  # Now direct threshold value (0-255)
+    'canny_high_ratio': 60,  # Now direct threshold value (0-255)
+
+    # Frequency - ILPF
+    'ilpf_radius': 30,
+
+    # Frequency - GLPF
+    'glpf_radius': 30,
+
+    # Frequency - BLPF
+    'blpf_radius': 30,
+    'blpf_order': 2,
+
+    # Frequency - IHPF
+    'ihpf_radius': 30,
+
+    # Frequency - GHPF
+    'ghpf_radius': 30,
+
+    # Frequency - BHPF
+    'bhpf_radius': 30,
+    'bhpf_order': 2,
+
+    # Arithmetic Mean
+    'arith_kernel': 3,
+
+    # Geometric Mean
+    'geo_kernel': 3,
+
+    # Harmonic Mean
+    'harm_kernel': 3,
+
+    # Contraharmonic Mean
+    'contra_kernel': 3,
+    'contra_Q': 1.5,
+
+    # Median Filter
+    'median_kernel': 3,
+
+    # Min Filter
+    'min_kernel': 3,
+
+    # Max Filter
+    'max_kernel': 3,
+
+    # Midpoint Filter
+    'midpoint_kernel': 3,
+}
+
+
+class FilterMaskCache:
+    """
+    LRU cache of frequency-domain filter masks.
+
+    Masks are keyed by (frame shape, filter kind, radius, order) and the
+    distance grid D they are built from is cached once per frame shape, so a
+    live stream with fixed resolution and parameters builds each mask once.
+
+    Masks are laid out like the CCS-packed half spectrum that cv2.dft
+    produces for real input (same (rows, cols) shape, real and imaginary
+    parts stored side by side), unshifted, with distances measured from the
+    zero frequency at [0, 0]. Because every mask is real and radially
+    symmetric, filtering is a plain element-wise multiply of the packed
+    spectrum and no fftshift is needed. Cached masks are read-only;
+    DFT_and_reconstruct only multiplies by them. Besides `max_masks`, the
+    masks' total size is capped at `max_bytes` (a 4K mask is 33 MB, so a
+    radius sweep would otherwise pin half a gigabyte).
+    """
+
+    def __init__(self, max_masks=16, max_shapes=4, max_bytes=256 * 1024 * 1024):
+        self.max_masks = max_masks
+        self.max_shapes = max_shapes
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._masks = OrderedDict()
+        self._distances = OrderedDict()
+        self._dft_shapes = {}
+        self._lock = threading.Lock()
+
+    def dft_shape(self, shape):
+        """Padded (rows, cols) that cv2.dft handles fastest, remembered per input shape."""
+        shape = tuple(shape)
+        padded = self._dft_shapes.get(shape)
+        if padded is None:
+            rows, cols = shape
+            padded = (cv2.getOptimalDFTSize(rows), cv2.getOptimalDFTSize(cols))
+            self._dft_shapes[shape] = padded
+        return padded
+
+    def get(self, shape, kind, radius, order=None):
+        """Return the CCS-packed float32 mask for a filter kind."""
+        if kind not in ('blpf', 'bhpf'):
+            order = None
+        key = (tuple(shape), kind, radius, order)
+
+        with self._lock:
+            mask = self._masks.get(key)
+            if mask is not None:
+                self._masks.move_to_end(key)
+                return mask
+
+        mask = self.build(kind, self.distance(shape), radius, order)
+        mask.setflags(write=False)
+
+        with self._lock:
+            old = self._masks.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._masks[key] = mask
+            self.nbytes += mask.nbytes
+            while len(self._masks) > 1 and (len(self._masks) > self.max_masks
+                                            or self.nbytes > self.max_bytes):
+                _, evicted = self._masks.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return mask
+
+    def distance(self, shape):
+        """
+        Squared distance from the zero frequency for a frame shape, as float32.
+
+        Integer squared distances are exact in float32 up to 2**24 (frames
+        of roughly 8K), and every mask is a function of the squared distance,
+        so masks are built without a sqrt or any float64 temporaries.
+        """
+        shape = tuple(shape)
+        with self._lock:
+            d2 = self._distances.get(shape)
+            if d2 is not None:
+                self._distances.move_to_end(shape)
+                return d2
+
+        rows, cols = shape
+        r = np.arange(rows, dtype=np.int64)[:, None]
+        c = np.arange(cols, dtype=np.int64)[None, :]
+
+        # CCS packing: column c holds horizontal frequency (c + 1) // 2. The
+        # first column (and the last one for even widths) packs a real
+        # column transform the same way along the rows; every other column
+        # holds full rows whose frequency wraps negative past the middle.
+        x = (c + 1) // 2
+        y = np.minimum(r, rows - r)
+        packed = (c == 0) | ((cols % 2 == 0) & (c == cols - 1))
+        y = np.where(packed, (r + 1) // 2, y)
+
+        d2 = (x ** 2 + y ** 2).astype(np.float32)
+        d2.setflags(write=False)
+
+        with self._lock:
+            self._distances[shape] = d2
+            while len(self._distances) > self.max_shapes:
+                self._distances.popitem(last=False)
+        return d2
+
+    @staticmethod
+    def build(kind, d2, r, n=None):
+        """
+        Float32 transfer function H for a filter kind on a squared-distance grid.
+
+        Each mask is built in one float32 buffer with in-place operations;
+        a 4K Gaussian mask takes ~15 ms instead of ~160 ms in float64, so a
+        radius step costs about as much as the inverse transform.
+        """
+        if kind == 'ilpf':
+            return (d2 <= r * r).astype(np.float32)
+        if kind == 'ihpf':
+            return (d2 > r * r).astype(np.float32)
+
+        D0 = float(r) if r > 0 else 1.0
+        if kind in ('glpf', 'ghpf'):
+            # exp(-D^2 / (2 D0^2))
+            H = np.multiply(d2, np.float32(-1 / (2 * D0 * D0)))
+            np.exp(H, out=H)
+        elif kind in ('blpf', 'bhpf'):
+            # 1 / (1 + (D / D0)^(2n)), with the power taken on D^2 / D0^2
+            H = np.multiply(d2, np.float32(1 / (D0 * D0)))
+            cv2.pow(H, n, dst=H)
+            H += 1
+            np.divide(1, H, out=H)
+        else:
+            raise ValueError(f"Unknown frequency filter: {kind}")
+
+        if kind in ('ghpf', 'bhpf'):
+            np.subtract(1, H, out=H)
+        return H
+
+
+class ImageContext:
+    """
+    One static image plus intermediates that several filters share.
+
+    `key` identifies the image by content (shape, dtype and a hash of the
+    pixels), so reloading the same file hits the result cache again.
+    Intermediates such as the grayscale image or the forward DFT spectrum
+    are computed on first use and kept read-only. An intermediate is only
+    shared when it is derived from the context's own frame (or from another
+    of its intermediates); chain stages working on filtered frames never
+    pick them up.
+
+    Kept intermediates are capped at `max_bytes` in total (a float32 copy of
+    a 100 MP scan alone is 400 MB): the least recently used are dropped
+    first, and one larger than the whole budget is returned without being
+    kept. A dropped intermediate is simply recomputed when needed again.
+    """
+
+    def __init__(self, frame, max_bytes=256 * 1024 * 1024):
+        self.frame = frame
+        digest = hashlib.blake2b(np.ascontiguousarray(frame), digest_size=16).hexdigest()
+        self.key = (frame.shape, frame.dtype.str, digest)
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def derives(self, source):
+        """True if `source` is the context's frame or one of its intermediates."""
+        if source is self.frame:
+            return True
+        with self._lock:
+            return any(source is item for item in self._items.values())
+
+    def get(self, name, compute):
+        with self._lock:
+            item = self._items.get(name)
+            if item is not None:
+                self._items.move_to_end(name)
+                return item
+        item = compute()
+        item.setflags(write=False)
+        if item.nbytes > self.max_bytes:
+            return item
+        with self._lock:
+            kept = self._items.get(name)
+            if kept is not None:
+                return kept
+            self._items[name] = item
+            self.nbytes += item.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return item
+
+
+class ResultCache:
+    """
+    Byte-budgeted LRU cache of filter results for static images.
+
+    Keys combine the ImageContext key, the mode and the values of the
+    parameters that mode declares in FILTERS, so flipping back to an earlier
+    filter or setting is a lookup. Least recently used results are evicted
+    once their total size exceeds `max_bytes`. Cached results are read-only.
+    """
+
+    def __init__(self, max_bytes=128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key):
+        with self._lock:
+            result = self._results.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._results.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        if result.nbytes > self.max_bytes:
+            return
+        result.setflags(write=False)
+        with self._lock:
+            old = self._results.pop(key, None)
+            if old is not None:
+                self.nbytes -= old.nbytes
+            self._results[key] = result
+            self.nbytes += result.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._results.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.nbytes = 0
+
+    def stats_text(self):
+        return (f"Cache {self.hits} hits / {self.misses} misses | "
+                f"{len(self._results)} results, {self.nbytes / 2 ** 20:.1f} MB")
+
+
+class FilterProcessor:
+    """
+    GUI-free host for every filter.
+
+    Holds the filter parameters, the active mode and the frequency mask
+    cache. The Tk application inherits from it, and the headless batch
+    mode (batch.py) uses it directly, so both run the same implementations.
+    """
+
+    def __init__(self, params=None, mode=None):
+        self.params = dict(DEFAULT_PARAMS)
+        if params:
+            self.params.update(params)
+        self.current_mode = mode
+
+        # Stages used when current_mode is CHAIN_MODE
+        self.chain = FilterChain()
+
+        # Frequency filter masks, reused while shape and parameters are unchanged
+        self.mask_cache = FilterMaskCache()
+
+        # Memoized results for static images (see apply_filter's context)
+        self.result_cache = ResultCache()
+
+        # Optional tiling.TiledExecutor: large images run tiled on a thread pool
+        self.tiler = None
+
+        # Stage timings ('gray', 'filter'); disabled unless the GUI turns it on
+        self.profiler = StageProfiler()
+
+        # One of COLOR_MODES; chains and edge filters always work in grayscale
+        self.color_mode = 'gray'
+
+        # Headless callers (batch.py) set this so filter errors raise instead
+        # of printing and returning the unfiltered frame
+        self.strict = False
+
+        # Implementations of the steps OpenCV has no primitive for (kernels.py):
+        # compiled with numba when it is installed, NumPy otherwise
+        self.backend = get_backend()
+
+        # Optional pipeline.BufferPool that filter results are written into
+        # (the live view sets one and releases results it has displayed)
+        self.output_pool = None
+
+        # Per-thread temporaries shared by every filter (and chain stage),
+        # and the ImageContext of the frame being filtered, if any
+        self._scratch = threading.local()
+        self._context = threading.local()
+
+    def apply_filter(self, frame, context=None, scale=1.0):
+        """
+        Apply the active filter (or filter chain) with its parameters.
+
+        Returns the single-channel uint8 result; expanding it to BGR is left
+        to display/save code that actually needs three channels.
+
+        Pass the frame's ImageContext for static images: results are then
+        memoized in `result_cache` and the filters share the context's
+        intermediates. Live frames are never hashed or cached.
+
+        A failing filter prints the error and returns the input frame, so
+        the GUI keeps running; with `strict` set the exception propagates.
+
+        `scale` says the frame was resized by that factor from the
+        resolution the parameters are set for (the live view's adaptive
+        working resolution); window sizes are scaled to match, see
+        scaled_params.
+        """
+        if frame is None or self.current_mode is None:
+            return frame
+
+        key = None
+        if context is not None:
+            key = self.result_key(context)
+            result = self.result_cache.get(key) if key is not None else None
+            if result is not None:
+                return result
+
+        self._context.current = context
+        try:
+            with self.profiler.stage('filter'):
+                if self.current_mode == CHAIN_MODE:
+                    chain = self.chain if scale == 1.0 else self.chain.scaled(scale)
+                    result = chain.run(self, frame) if chain.stages else frame
+                else:
+                    spec = FILTERS.get(self.current_mode)
+                    if spec is None:
+                        return frame
+                    params = self.params if scale == 1.0 else scaled_params(spec, self.params, scale)
+                    result = self.run_spec(spec, frame, params)
+        except Exception as e:
+            if self.strict:
+                raise
+            print(f"Error: {e}")
+            return frame
+        finally:
+            self._context.current = None
+
+        if key is not None and result is not frame:
+            self.result_cache.put(key, result)
+        return result
+
+    def run_spec(self, spec, frame, params):
+        """
+        Run one registry filter, tiled when `tiler` is set and the image is large.
+
+        Filters without a halo need the whole image (Canny's hysteresis, the
+        frequency filters) and always run untiled. Filters normalized by the
+        image's peak declare `magnitude` and run in two tiled passes: one for
+        the global peak, one to scale each tile by it. Color-aware filters
+        on BGR frames go through run_color unless color_mode is 'gray'.
+        """
+        if spec.color and self.color_mode != 'gray' and frame.ndim == 3:
+            return self.run_color(spec, frame, params)
+        tiler = self.tiler
+        if tiler is None or spec.halo is None or not tiler.worth_tiling(frame):
+            return spec.run(self, frame, params)
+        return self._run_tiled(tiler, spec, frame, params)
+
+    def run_color(self, spec, frame, params):
+        """
+        Run a color-aware filter on a BGR frame according to color_mode; returns BGR.
+
+        'ycrcb' filters only the Y plane. 'bgr' filters the three channels
+        concurrently on a shared thread pool (OpenCV releases the GIL); each
+        channel is a single-channel image, so it takes the usual path,
+        tiling included, and frequency filters look up their mask once for
+        all three. Filters normalized by their peak are scaled by the
+        largest peak of the three channels, which keeps the color balance.
+        """
+        if self.color_mode == 'ycrcb':
+            ycrcb = cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb)
+            luma = self.run_spec(spec, cv2.extractChannel(ycrcb, 0), params)
+            cv2.insertChannel(luma, ycrcb, 0)
+            return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR)
+
+        channels = cv2.split(frame)
+        if spec.magnitude is None:
+            results = list(_channel_pool().map(lambda channel: self.run_spec(spec, channel, params), channels))
+            merged = cv2.merge(results)
+            if self.output_pool is not None:
+                for result in results:
+                    self.output_pool.release(result)
+            return merged
+        magnitudes = list(_channel_pool().map(
+            lambda channel: spec.magnitude(self, channel, params), channels))
+        peak = max(magnitude.max() for magnitude in magnitudes)
+        return cv2.merge([self.normalize_peak(magnitude, peak) for magnitude in magnitudes])
+
+    def apply_tiled(self, frame, out, tiler):
+        """
+        Apply the active filter (or chain) tile by tile, writing into `out`.
+
+        Used for rasters streamed from disk: `frame` and `out` can be any
+        array-likes that tiler accepts. Raises ValueError when the filter
+        needs the whole image.
+        """
+        if self.current_mode == CHAIN_MODE:
+            halo = self.chain.halo()
+            if halo is None:
+                raise ValueError("the chain has a stage that can't be tiled")
+            return tiler.map(lambda tile: self.chain.run_stages(self, tile), frame, halo, out)
+
+        spec = FILTERS[self.current_mode]
+        if spec.halo is None:
+            raise ValueError(f"{spec.name} needs the whole image and can't be tiled")
+        return self._run_tiled(tiler, spec, frame, self.params, out)
+
+    def _run_tiled(self, tiler, spec, frame, params, out=None):
+        halo = spec.halo(params)
+        if spec.magnitude is None:
+            return tiler.map(lambda tile: spec.run(self, tile, params), frame, halo, out)
+
+        def magnitude(tile):
+            return spec.magnitude(self, tile, params)
+        peak = tiler.peak(magnitude, frame, halo)
+        return tiler.map(lambda tile: self.normalize_peak(magnitude(tile), peak), frame, halo, out)
+
+    def result_key(self, context):
+        """Cache key for the active mode: image, mode and the parameters it declares."""
+        if self.current_mode == CHAIN_MODE:
+            stages = tuple((mode, tuple(sorted(params.items()))) for mode, params in self.chain.stages)
+            return context.key, CHAIN_MODE, stages
+        spec = FILTERS.get(self.current_mode)
+        if spec is None:
+            return None
+        color = self.color_mode if spec.color else 'gray'
+        return context.key, spec.mode, color, tuple(self.params[p.key] for p in spec.params)
+
+    def shared(self, name, source, compute):
+        """
+        Intermediate `name` derived from `source`, shared through the active ImageContext.
+
+        Without a context, or when `source` doesn't come from the context's
+        frame, this is just compute(), which may return a scratch buffer;
+        the context keeps a copy of those. Shared intermediates are read-only.
+        """
+        context = getattr(self._context, 'current', None)
+        if context is None or not context.derives(source):
+            return compute()
+
+        def owned():
+            item = compute()
+            buffers = getattr(self._scratch, 'buffers', {})
+            return item.copy() if any(item is buf for buf in buffers.values()) else item
+        return context.get(name, owned)
+
+    def to_gray(self, frame):
+        """Grayscale view of a frame; single-channel input is passed through."""
+        if frame.ndim == 2:
+            return frame
+
+        def convert():
+            with self.profiler.stage('gray'):
+                return cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY,
+                                    dst=self.scratch('gray', frame.shape[:2], np.uint8))
+        return self.shared('gray', frame, convert)
+
+    def scratch(self, name, shape, dtype=np.float32):
+        """
+        Reusable temporary array for the calling thread.
+
+        Buffers are keyed by name and reallocated only when the shape or
+        dtype changes, so consecutive frames and chain stages reuse them.
+        Never return a scratch buffer as a filter result.
+        """
+        buffers = getattr(self._scratch, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch.buffers = {}
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = buffers[name] = np.empty(shape, dtype)
+        return buf
+
+    def output(self, shape, dtype=np.uint8):
+        """
+        Array for a filter result: from `output_pool` if set, else newly allocated.
+
+        Unlike scratch buffers, results leave the filter (to the display,
+        the result cache or the next chain stage), so pooled ones are only
+        reused after their consumer releases them.
+        """
+        if self.output_pool is None:
+            return np.empty(shape, dtype)
+        return self.output_pool.acquire(shape, dtype)
+
+    def to_output(self, array):
+        """Cast a float image to a uint8 result array, truncating like astype(np.uint8)."""
+        out = self.output(array.shape)
+        np.copyto(out, array, casting='unsafe')
+        return out
+
+    # ========== EXACT METHODS FROM NOTEBOOK ==========
+
+    def sobel_gray(self, frame):
+        """
+        Float32 grayscale in [0, 1] for the Sobel filters.
+
+        Uses the luma weights of skimage's rgb2gray (which the notebook
+        used), computed in one cv2.transform pass instead of a BGR->RGB copy
+        plus a float64 conversion. Single-channel input is only rescaled.
+        """
+        if frame.ndim == 2:
+            # A different computation from the BGR luma below, so a separate
+            # shared name: a context holds both for chain stages and filters
+            return self.shared('sobel_gray_1ch', frame,
+                               lambda: np.multiply(frame, 1 / 255, dtype=np.float32))
+
+        def convert():
+            src = self.scratch('sobel_bgr', frame.shape)
+            src[...] = frame
+            return cv2.transform(src, SOBEL_GRAY_WEIGHTS, dst=self.scratch('sobel_gray', frame.shape[:2]))
+        return self.shared('sobel_gray', frame, convert)
+
+    def sobelx_func(self, frame, ksize, gray=None):
+        if gray is None:
+            gray = self.sobel_gray(frame)
+        return cv2.Sobel(gray, cv2.CV_32F, 1, 0, dst=self.scratch('sobel_x', gray.shape), ksize=ksize)
+
+    def sobely_func(self, frame, ksize, gray=None):
+        if gray is None:
+            gray = self.sobel_gray(frame)
+        return cv2.Sobel(gray, cv2.CV_32F, 0, 1, dst=self.scratch('sobel_y', gray.shape), ksize=ksize)
+
+    def gradient_func(self, frame, ksize):
+        """
+        Gradient magnitude from a single grayscale conversion.
+
+        Both derivatives are computed in float32 from one shared gray image,
+        and magnitude and normalization run in place. Matches the former
+        float64 skimage path to within 1 gray level.
+        """
+        return self.normalize_peak(self.gradient_magnitude(frame, ksize))
+
+    def gradient_magnitude(self, frame, ksize):
+        """Unnormalized float32 gradient magnitude (a per-thread scratch buffer)."""
+        gray = self.sobel_gray(frame)
+        sobelx = self.sobelx_func(frame, ksize, gray)
+        sobely = self.sobely_func(frame, ksize, gray)
+        return cv2.magnitude(sobelx, sobely, magnitude=self.scratch('sobel_magnitude', gray.shape))
+
+    def gradient_magnitude_func(self, sobelx, sobely):
+        return self.normalize_peak(cv2.magnitude(sobelx, sobely))
+
+    def normalize_peak(self, magnitude, peak=None):
+        """Scale a float image in place so `peak` (default: its maximum) maps to 255, as uint8."""
+        if peak is None:
+            peak = magnitude.max()
+        if peak == 0:
+            out = self.output(magnitude.shape)
+            out.fill(0)
+            return out
+        magnitude *= 255.0 / peak
+        return self.to_output(magnitude)
+
+    def Canny_edge_detection(self, frame, ksize, low_threshold=None, high_threshold=None):
+        # Use the improved Canny implementation with direct threshold values (0-255)
+        if low_threshold is None:
+            low_threshold = self.params['canny_low_ratio']
+        if high_threshold is None:
+            high_threshold = self.params['canny_high_ratio']
+
+        # Every intermediate is a scratch buffer, so a frame allocates only
+        # its result (about 160 MB of temporaries per 1080p frame otherwise)
+        gray = self.to_gray(frame)
+        shape = gray.shape
+        blur = cv2.GaussianBlur(gray, (ksize, ksize), 0, dst=self.scratch('canny_blur', shape, np.uint8))
+        gx = cv2.Sobel(blur, cv2.CV_64F, 1, 0, ksize=ksize, dst=self.scratch('canny_gx', shape, np.float64))
+        gy = cv2.Sobel(blur, cv2.CV_64F, 0, 1, ksize=ksize, dst=self.scratch('canny_gy', shape, np.float64))
+        mag = np.hypot(gx, gy, out=self.scratch('canny_mag', shape, np.float64))
+        np.divide(mag, mag.max(), out=mag)
+        np.multiply(mag, 255, out=mag)
+        ang = np.arctan2(gy, gx, out=gx)
+        np.degrees(ang, out=ang)
+        mask = np.less(ang, 0, out=self.scratch('canny_mask', shape, np.bool_))
+        np.add(ang, 180, out=ang, where=mask)
+
+        # Non-Max Suppression
+        Z = self.non_max_suppression(mag, ang, out=self.scratch('canny_nms', shape))
+
+        # Double Threshold using direct threshold values
+        strong, weak = 255, 75
+        res = self.scratch('canny_res', shape, np.uint8)
+        res.fill(0)
+        np.copyto(res, strong, where=np.greater_equal(Z, high_threshold, out=mask))
+        weak_mask = np.less(Z, high_threshold, out=mask)
+        weak_mask &= np.greater_equal(Z, low_threshold, out=self.scratch('canny_mask_low', shape, np.bool_))
+        np.copyto(res, weak, where=weak_mask)
+
+        # Hysteresis
+        return self.hysteresis(res, strong, weak, out=self.output(shape))
+
+    def non_max_suppression(self, mag, ang, out=None):
+        """Keep only pixels that are local maxima along the gradient direction (see kernels)."""
+        return self.backend.non_max_suppression(mag, ang, out)
+
+    def hysteresis(self, res, strong, weak, out=None):
+        """Edge tracking by hysteresis on a double-thresholded image (see kernels)."""
+        return self.backend.hysteresis(res, strong, weak, out)
+
+    def DFT_and_reconstruct(self, gray_img, filter_mask=None, spectrum=False, pad=True):
+        """
+        Filter a grayscale image in the frequency domain.
+
+        Runs the three stages below: forward_dft, apply_mask and inverse_dft.
+        With pad=True the mask must have the padded shape from
+        FilterMaskCache.dft_shape. The log-magnitude display is only built
+        when spectrum=True; otherwise mag_display is None. Returns
+        (img_back, mag_display, dft) where dft is the packed spectrum.
+        """
+        dft = self.forward_dft(gray_img, pad)
+        img_back = self.inverse_dft(self.apply_mask(dft, filter_mask), gray_img.shape)
+        mag_display = self.magnitude_spectrum(dft) if spectrum else None
+        return img_back, mag_display, dft
+
+    def forward_dft(self, gray_img, pad=True):
+        """
+        CCS-packed spectrum of a grayscale image.
+
+        Uses a real-input cv2.dft, which returns the half spectrum in CCS
+        packed form, so masks from FilterMaskCache are applied without any
+        fftshift. With pad=True the image is reflect-padded to the size from
+        FilterMaskCache.dft_shape (odd camera resolutions transform much
+        faster that way). The spectrum of a static image is held by its
+        ImageContext, so frequency filters and radius sweeps on the same
+        image share one forward transform.
+        """
+        rows, cols = gray_img.shape
+
+        def forward():
+            img = self.scratch('dft_input', (rows, cols))
+            img[...] = gray_img
+            if pad:
+                prows, pcols = self.mask_cache.dft_shape(img.shape)
+                if (prows, pcols) != (rows, cols):
+                    img = cv2.copyMakeBorder(img, 0, prows - rows, 0, pcols - cols, cv2.BORDER_REFLECT,
+                                             dst=self.scratch('dft_padded', (prows, pcols)))
+            return cv2.dft(img, dst=self.scratch('dft', img.shape))
+        return self.shared('dft_padded' if pad else 'dft', gray_img, forward)
+
+    def apply_mask(self, dft, filter_mask=None):
+        """Multiply a packed spectrum by a mask, into a per-thread scratch buffer."""
+        if filter_mask is None:
+            return dft
+        return np.multiply(dft, filter_mask, out=self.scratch('dft_filtered', dft.shape))
+
+    def inverse_dft(self, filtered, shape):
+        """Inverse transform, cropped to `shape` and normalized to a uint8 image."""
+        return self.normalize_peak(
+            self.inverse_magnitude(filtered, shape, self.scratch('dft_back', filtered.shape)))
+
+    def inverse_magnitude(self, filtered, shape, dst=None):
+        """Absolute value of the inverse transform, cropped to `shape`, as float32."""
+        rows, cols = shape
+        img_back = cv2.idft(filtered, dst=dst, flags=cv2.DFT_REAL_OUTPUT)[:rows, :cols]
+        return np.abs(img_back, out=img_back)
+
+    def filter_stack(self, stack, kind, r, n=None, chunk_size=8, out=None):
+        """
+        Apply one frequency filter to every frame of an (N, H, W) stack.
+
+        For batch and video workloads with many same-sized frames and fixed
+        parameters: the mask is looked up once for the whole stack, and
+        frames are converted and padded `chunk_size` at a time into reused
+        per-thread buffers, so memory is bounded by the chunk rather than
+        the stack. Each frame still gets its own cv2.dft/idft, which is
+        several times faster than one batched np.fft.rfft2 over the stack
+        (see benchmarks/bench_frequency_stack.py). BGR stacks (N, H, W, 3)
+        are converted to grayscale. Results match filtering each frame on
+        its own.
+        """
+        count, rows, cols = stack.shape[:3]
+        prows, pcols = self.mask_cache.dft_shape((rows, cols))
+        mask = self.mask_cache.get((prows, pcols), kind, r, n)
+        if out is None:
+            out = np.empty((count, rows, cols), np.uint8)
+
+        chunk_size = max(1, min(chunk_size, count))
+        padded = self.scratch('stack_input', (chunk_size, prows, pcols))
+        spectrum = self.scratch('stack_dft', (prows, pcols))
+        back = self.scratch('stack_back', (prows, pcols))
+        for start in range(0, count, chunk_size):
+            frames = stack[start:start + chunk_size]
+            m = len(frames)
+            if frames.ndim == 4:
+                for i, frame in enumerate(frames):
+                    padded[i, :rows, :cols] = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            else:
+                padded[:m, :rows, :cols] = frames
+
+            # Same edge-inclusive reflection as cv2.BORDER_REFLECT in forward_dft
+            if prows > rows:
+                padded[:m, rows:, :cols] = padded[:m, _reflected(rows, prows), :cols]
+            if pcols > cols:
+                padded[:m, :, cols:] = padded[:m, :, _reflected(cols, pcols)]
+
+            # Transforms run frame by frame so each spectrum stays in cache
+            for i in range(m):
+                cv2.dft(padded[i], dst=spectrum)
+                np.multiply(spectrum, mask, out=spectrum)
+                cv2.idft(spectrum, dst=back, flags=cv2.DFT_REAL_OUTPUT)
+                magnitude = np.abs(back[:rows, :cols], out=back[:rows, :cols])
+                peak = magnitude.max()
+                if peak == 0:
+                    out[start + i] = 0
+                else:
+                    magnitude *= 255.0 / peak
+                    out[start + i] = magnitude
+        return out
+
+    def unpack_spectrum(self, dft):
+        """Unpack a CCS-packed spectrum into the complex half spectrum (rows, cols // 2 + 1)."""
+        rows, cols = dft.shape
+        half = np.zeros((rows, cols // 2 + 1), np.complex64)
+
+        # Interior columns store (Re, Im) pairs for every row
+        last = (cols - 1) // 2
+        half[:, 1:last + 1] = dft[:, 1:2 * last:2] + 1j * dft[:, 2:2 * last + 1:2]
+
+        # Column 0 (and Nyquist column for even widths) is itself packed along rows
+        packed_cols = [(0, 0)] + ([(cols // 2, cols - 1)] if cols % 2 == 0 else [])
+        for j, c in packed_cols:
+            col = dft[:, c]
+            half[0, j] = col[0]
+            k = np.arange(1, (rows - 1) // 2 + 1)
+            half[k, j] = col[2 * k - 1] + 1j * col[2 * k]
+            half[rows - k, j] = np.conj(half[k, j])
+            if rows % 2 == 0:
+                half[rows // 2, j] = col[rows - 1]
+        return half
+
+    def magnitude_spectrum(self, dft):
+        """Centered log-magnitude image of a CCS-packed spectrum, for display."""
+        rows, cols = dft.shape
+        half = np.abs(self.unpack_spectrum(dft))
+        hc = half.shape[1]
+
+        # Rebuild the missing columns from conjugate symmetry: |F(-u, -v)| = |F(u, v)|
+        magnitude = np.empty((rows, cols), half.dtype)
+        magnitude[:, :hc] = half
+        if cols > hc:
+            row_idx = (-np.arange(rows)) % rows
+            col_idx = cols - np.arange(hc, cols)
+            magnitude[:, hc:] = half[row_idx[:, None], col_idx]
+        magnitude = np.fft.fftshift(magnitude)
+
+        c = 255.0 / (np.log(1 + np.max(magnitude)) + 1e-9)
+        magnitude_spectrum = c * np.log(magnitude + 1)
+        return np.uint8(np.clip(magnitude_spectrum, 0, 255))
+
+    def frequency_filter(self, frame, kind, r, n=None, spectrum=False):
+        """Shared body of the six frequency filters: grayscale, cached mask, DFT."""
+        gray = self.to_gray(frame)
+        mask = self.mask_cache.get(self.mask_cache.dft_shape(gray.shape), kind, r, n)
+        img_back, mag_display, _ = self.DFT_and_reconstruct(gray, filter_mask=mask, spectrum=spectrum)
+        return img_back, mag_display
+
+    def frequency_magnitude(self, frame, kind, r, n=None):
+        """Unnormalized float32 result of a frequency filter (see run_color)."""
+        gray = self.to_gray(frame)
+        mask = self.mask_cache.get(self.mask_cache.dft_shape(gray.shape), kind, r, n)
+        return self.inverse_magnitude(self.apply_mask(self.forward_dft(gray), mask), gray.shape)
+
+    def ILPF(self, frame, r, spectrum=False):
+        return self.frequency_filter(frame, 'ilpf', r, spectrum=spectrum)
+
+    def GLPF(self, frame, r, spectrum=False):
+        return self.frequency_filter(frame, 'glpf', r, spectrum=spectrum)
+
+    def BLPF(self, frame, r, n=2, spectrum=False):
+        return self.frequency_filter(frame, 'blpf', r, n, spectrum=spectrum)
+
+    def IHPF(self, frame, r, spectrum=False):
+        return self.frequency_filter(frame, 'ihpf', r, spectrum=spectrum)
+
+    def GHPF(self, frame, r, spectrum=False):
+        return self.frequency_filter(frame, 'ghpf', r, spectrum=spectrum)
+
+    def BHPF(self, frame, r, n=2, spectrum=False):
+        return self.frequency_filter(frame, 'bhpf', r, n, spectrum=spectrum)
+
+    # Mean filters use box sums (cv2.blur / cv2.boxFilter with
+    # normalize=False), which keep running sums per row and column: the
+    # per-pixel cost is the same for every kernel size, unlike filter2D with
+    # a dense k x k kernel.
+
+    def arithmetic_mean_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+        return cv2.blur(gray, (ksize, ksize), dst=self.output(gray.shape))
+
+    def geometric_mean_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+
+        def log_image():
+            log_img = self.scratch('mean_a', gray.shape)
+            np.add(gray, 1.0, out=log_img)
+            return np.log(log_img, out=log_img)
+        log_img = self.shared('log', gray, log_image)
+        geo_mean = cv2.blur(log_img, (ksize, ksize), dst=self.scratch('mean_b', gray.shape))
+        np.exp(geo_mean, out=geo_mean)
+        np.clip(geo_mean, 0, 255, out=geo_mean)
+        return self.to_output(geo_mean)
+
+    def harmonic_mean_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+
+        def inverse_image():
+            inv = self.scratch('mean_a', gray.shape)
+            np.add(gray, 1.0, out=inv)
+            return np.divide(1.0, inv, out=inv)
+        inv = self.shared('inverse', gray, inverse_image)
+        h_mean = cv2.boxFilter(inv, -1, (ksize, ksize), dst=self.scratch('mean_b', gray.shape),
+                               normalize=False)
+        np.divide(ksize * ksize, h_mean, out=h_mean)
+        np.clip(h_mean, 0, 255, out=h_mean)
+        return self.to_output(h_mean)
+
+    def contraharmonic_mean_filter(self, frame, ksize, Q=1.5):
+        """
+        Sum(g^(Q+1)) / Sum(g^Q) over each window, from a single power.
+
+        g^Q is computed once; the denominator sums it and the numerator sums
+        g^Q * g. For Q < 0 a zero pixel makes g^Q infinite, and the windows
+        around it come out as 0 (the limit of the ratio); those pixels are
+        set explicitly, since inf would turn the running box sums into NaN.
+        """
+        gray = self.to_gray(frame)
+        ksize = (ksize, ksize)
+        g = self.scratch('mean_a', gray.shape)
+        g[...] = gray
+
+        zeros = None
+        if Q < 0:
+            zeros = gray == 0
+            if zeros.any():
+                g[zeros] = 1
+            else:
+                zeros = None
+
+        # powered = g^Q, g = g^(Q+1)
+        powered = self.scratch('mean_b', gray.shape)
+        self.backend.contraharmonic_powers(g, Q, powered)
+        denominator = cv2.boxFilter(powered, -1, ksize, dst=self.scratch('mean_c', gray.shape),
+                                    normalize=False)
+        numerator = cv2.boxFilter(g, -1, ksize, dst=powered, normalize=False)
+        denominator += 1e-9
+        ch_mean = np.divide(numerator, denominator, out=numerator)
+        np.clip(ch_mean, 0, 255, out=ch_mean)
+        ch_mean = self.to_output(ch_mean)
+
+        if zeros is not None:
+            near_zero = cv2.boxFilter(zeros.view(np.uint8), -1, ksize, normalize=False)
+            ch_mean[near_zero > 0] = 0
+        return ch_mean
+
+    def median_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+        ksize = ksize if ksize % 2 == 1 else ksize + 1
+        return cv2.medianBlur(gray, ksize, dst=self.output(gray.shape))
+
+    def min_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+        return self.window_extremes(gray, ksize, maximum=False, dst=(self.output(gray.shape), None))[0]
+
+    def max_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+        return self.window_extremes(gray, ksize, minimum=False, dst=(None, self.output(gray.shape)))[1]
+
+    def midpoint_filter(self, frame, ksize):
+        gray = self.to_gray(frame)
+        min_f, max_f = self.window_extremes(gray, ksize, dst=(self.scratch('morph_min', gray.shape, np.uint8),
+                                                              self.scratch('morph_max', gray.shape, np.uint8)))
+        return self.backend.midpoint(min_f, max_f, self.output(gray.shape))
+
+    def window_extremes(self, gray, ksize, minimum=True, maximum=True, dst=(None, None)):
+        """
+        Minimum and maximum over each k x k window, as (min, max).
+
+        Skipped extremes are None; `dst` optionally gives the output arrays
+        for the OpenCV path. Small kernels use OpenCV's rectangular
+        erode/dilate, which already run separably over rows and columns but
+        cost O(k) per pixel. From MORPH_TABLE_MIN_KERNEL up, both extremes
+        come from one replicate-padded copy of the image with
+        _window_extreme, at O(log k) vectorized passes per axis. Pixels
+        outside the image never affect the result on either path.
+        """
+        if ksize < MORPH_TABLE_MIN_KERNEL:
+            kernel = _square_kernel(ksize)
+            return (cv2.erode(gray, kernel, dst=dst[0]) if minimum else None,
+                    cv2.dilate(gray, kernel, dst=dst[1]) if maximum else None)
+
+        r = ksize // 2
+        padded = cv2.copyMakeBorder(gray, r, r, r, r, cv2.BORDER_REPLICATE)
+        results = []
+        for wanted, op in ((minimum, np.minimum), (maximum, np.maximum)):
+            if not wanted:
+                results.append(None)
+                continue
+            rows = _window_extreme(padded, ksize, op, axis=0)
+            results.append(np.ascontiguousarray(_window_extreme(rows, ksize, op, axis=1)))
+        return tuple(results)
+
+# ========== FILTER REGISTRY ==========
+
+EDGE = "🔍 EDGE DETECTION"
+LOW_PASS = "🌊 LOW-PASS FILTERS (Smoothing)"
+HIGH_PASS = "⚡ HIGH-PASS FILTERS (Sharpening)"
+MEAN = "📊 MEAN FILTERS (Noise Reduction)"
+ORDER = "📈 ORDER STATISTIC FILTERS"
+
+# (param_key, label, min_val, max_val, step, tip), as used by the GUI controls
+ParamSpec = namedtuple('ParamSpec', 'key label min max step tip')
+
+
+class FilterSpec:
+    """
+    Registry entry for one filter mode.
+
+    Declares the display name, keyboard shortcut, GUI section and parameter
+    schema, plus `run(processor, frame, params)`, which returns the
+    single-channel uint8 result.
+
+    `halo(params)` gives the neighbourhood radius each output pixel depends
+    on, which lets FilterProcessor.run_spec tile large images; None means
+    the filter needs the whole image. Filters that scale their output by
+    the image's peak also declare `magnitude(processor, frame, params)`,
+    the unnormalized float result, so tiles (and color channels) can share
+    one global peak. `color` marks filters that FilterProcessor.run_color
+    can apply per channel or to luma only. `spatial` lists the parameters
+    measured in image pixels (window sizes), which scaled_params rescales
+    for frames filtered at a reduced resolution.
+    """
+
+    def __init__(self, mode, name, key, section, params, run, halo=None, magnitude=None,
+                 color=False, spatial=()):
+        self.mode = mode
+        self.name = name
+        self.key = key
+        self.section = section
+        self.params = params
+        self.run = run
+        self.halo = halo
+        self.magnitude = magnitude
+        self.color = color
+        self.spatial = spatial
+
+
+def scaled_params(spec, params, scale):
+    """
+    Parameters of `spec` for a frame resized by `scale`.
+
+    Window sizes in `spec.spatial` are scaled with the frame, rounded to the
+    nearest odd size, so a window covers the same part of the scene at every
+    resolution. Frequency cutoffs are in cycles per image and don't depend
+    on the resolution; Sobel and Canny apertures are kept, since shrinking
+    a 3x3 derivative to 1x1 would change the operator rather than its reach.
+    """
+    scaled = dict(params)
+    for key in spec.spatial:
+        scaled[key] = max(2 * int((params[key] * scale - 1) / 2 + 0.5) + 1, 1)
+    return scaled
+
+
+def _window_extreme(padded, ksize, op, axis):
+    """
+    Running `op` (np.minimum / np.maximum) over windows of ksize along an axis.
+
+    `padded` carries ksize // 2 extra elements on both ends of the axis.
+    After j doubling passes each element holds the extreme of the next 2^j
+    elements; any window of ksize is then covered by two overlapping 2^j
+    spans (a sparse table), so the cost grows with log2(k).
+    """
+    m = np.moveaxis(padded, axis, 0)
+    n = m.shape[0] - 2 * (ksize // 2)
+    width = 1
+    while 2 * width <= ksize:
+        m = op(m[:-width], m[width:])
+        width *= 2
+    return np.moveaxis(op(m[:n], m[ksize - width:ksize - width + n]), 0, axis)
+
+
+_CHANNEL_POOL = None
+_CHANNEL_POOL_LOCK = threading.Lock()
+
+
+def _channel_pool():
+    """Thread pool for the three channels of run_color, shared by all processors."""
+    global _CHANNEL_POOL
+    with _CHANNEL_POOL_LOCK:
+        if _CHANNEL_POOL is None:
+            _CHANNEL_POOL = ThreadPoolExecutor(3, thread_name_prefix='channel')
+    return _CHANNEL_POOL
+
+
+@lru_cache(maxsize=None)
+def _square_kernel(ksize):
+    kernel = np.ones((ksize, ksize), np.uint8)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def _reflected(size, padded_size):
+    """Slice mirroring the last padded_size - size elements of an axis, edge included."""
+    stop = 2 * size - padded_size - 1
+    return slice(size - 1, stop if stop >= 0 else None, -1)
+
+
+def _halo(key):
+    # One spare pixel also covers ksize=1 Sobel, which uses a 3-tap kernel
+    return lambda p: p[key] // 2 + 1
+
+
+def _kernel(key, tip):
+    return ParamSpec(key, "Kernel Size", 1, 31, 2, tip)
+
+
+def _radius(key, tip):
+    return ParamSpec(key, "Cutoff Radius", 1, 200, 5, tip)
+
+
+def _order(key):
+    return ParamSpec(key, "Order (n)", 1, 10, 1, "2-4 typical")
+
+
+def _frequency_magnitude(kind, order=False):
+    return lambda proc, frame, p: proc.frequency_magnitude(
+        frame, kind, p[f'{kind}_radius'], p[f'{kind}_order'] if order else None)
+
+
+# Insertion order is the display order of the control panel
+FILTERS = {spec.mode: spec for spec in [
+    # Edge detection
+    FilterSpec('sobelx', "Sobel X", 'X', EDGE, [_kernel('sobel_kernel', "3-7 optimal")],
+               lambda proc, frame, p: proc.to_output(proc.sobelx_func(frame, p['sobel_kernel'])),
+               halo=_halo('sobel_kernel')),
+    FilterSpec('sobely', "Sobel Y", 'Y', EDGE, [_kernel('sobel_kernel', "3-7 optimal")],
+               lambda proc, frame, p: proc.to_output(proc.sobely_func(frame, p['sobel_kernel'])),
+               halo=_halo('sobel_kernel')),
+    FilterSpec('gradient', "Gradient Magnitude", 'S', EDGE, [_kernel('sobel_kernel', "3-7 optimal")],
+               lambda proc, frame, p: proc.gradient_func(frame, p['sobel_kernel']),
+               halo=_halo('sobel_kernel'),
+               magnitude=lambda proc, frame, p: proc.gradient_magnitude(frame, p['sobel_kernel'])),
+    FilterSpec('canny', "Canny Edge", 'C', EDGE, [
+        _kernel('canny_kernel', "3-7 optimal"),
+        ParamSpec('canny_sigma', "Gaussian Sigma", 0, 10, 1, "0=auto, 1-3 typical"),
+        ParamSpec('canny_low_ratio', "Low Threshold", 0, 255, 5, "30-100 typical"),
+        ParamSpec('canny_high_ratio', "High Threshold", 0, 255, 5, "60-200 typical"),
+    ], lambda proc, frame, p: proc.Canny_edge_detection(frame, p['canny_kernel'],
+                                                        p['canny_low_ratio'], p['canny_high_ratio'])),
+
+    # Frequency filters
+    FilterSpec('ilpf', "Ideal LPF", '1', LOW_PASS, [_radius('ilpf_radius', "10-50 typical")],
+               lambda proc, frame, p: proc.ILPF(frame, p['ilpf_radius'])[0],
+               magnitude=_frequency_magnitude('ilpf'), color=True),
+    FilterSpec('glpf', "Gaussian LPF", '2', LOW_PASS, [_radius('glpf_radius', "20-80 optimal")],
+               lambda proc, frame, p: proc.GLPF(frame, p['glpf_radius'])[0],
+               magnitude=_frequency_magnitude('glpf'), color=True),
+    FilterSpec('blpf', "Butterworth LPF", '3', LOW_PASS, [
+        _radius('blpf_radius', "20-80 optimal"), _order('blpf_order'),
+    ], lambda proc, frame, p: proc.BLPF(frame, p['blpf_radius'], p['blpf_order'])[0],
+        magnitude=_frequency_magnitude('blpf', order=True), color=True),
+    FilterSpec('ihpf', "Ideal HPF", '4', HIGH_PASS, [_radius('ihpf_radius', "10-50 typical")],
+               lambda proc, frame, p: proc.IHPF(frame, p['ihpf_radius'])[0],
+               magnitude=_frequency_magnitude('ihpf'), color=True),
+    FilterSpec('ghpf', "Gaussian HPF", '5', HIGH_PASS, [_radius('ghpf_radius', "20-80 optimal")],
+               lambda proc, frame, p: proc.GHPF(frame, p['ghpf_radius'])[0],
+               magnitude=_frequency_magnitude('ghpf'), color=True),
+    FilterSpec('bhpf', "Butterworth HPF", '6', HIGH_PASS, [
+        _radius('bhpf_radius', "20-80 optimal"), _order('bhpf_order'),
+    ], lambda proc, frame, p: proc.BHPF(frame, p['bhpf_radius'], p['bhpf_order'])[0],
+        magnitude=_frequency_magnitude('bhpf', order=True), color=True),
+
+    # Mean filters
+    FilterSpec('arith_mean', "Arithmetic Mean", 'A', MEAN, [_kernel('arith_kernel', "3-9 optimal")],
+               lambda proc, frame, p: proc.arithmetic_mean_filter(frame, p['arith_kernel']),
+               halo=_halo('arith_kernel'), color=True, spatial=('arith_kernel',)),
+    FilterSpec('geo_mean', "Geometric Mean", 'G', MEAN, [_kernel('geo_kernel', "3-7 for Gaussian noise")],
+               lambda proc, frame, p: proc.geometric_mean_filter(frame, p['geo_kernel']),
+               halo=_halo('geo_kernel'), color=True, spatial=('geo_kernel',)),
+    FilterSpec('harm_mean', "Harmonic Mean", 'H', MEAN, [_kernel('harm_kernel', "3-7 for salt noise")],
+               lambda proc, frame, p: proc.harmonic_mean_filter(frame, p['harm_kernel']),
+               halo=_halo('harm_kernel'), color=True, spatial=('harm_kernel',)),
+    FilterSpec('contra_mean', "Contraharmonic Mean", 'M', MEAN, [
+        _kernel('contra_kernel', "3-7 optimal"),
+        ParamSpec('contra_Q', "Q Order", -5.0, 5.0, 0.2, "Q>0: pepper | Q<0: salt"),
+    ], lambda proc, frame, p: proc.contraharmonic_mean_filter(frame, p['contra_kernel'], p['contra_Q']),
+        halo=_halo('contra_kernel'), color=True, spatial=('contra_kernel',)),
+
+    # Order statistic
+    FilterSpec('median', "Median Filter", 'D', ORDER, [_kernel('median_kernel', "3-9 for salt & pepper")],
+               lambda proc, frame, p: proc.median_filter(frame, p['median_kernel']),
+               halo=_halo('median_kernel'), color=True, spatial=('median_kernel',)),
+    FilterSpec('min', "Min Filter (Erosion)", 'I', ORDER, [_kernel('min_kernel', "3-7 removes white")],
+               lambda proc, frame, p: proc.min_filter(frame, p['min_kernel']),
+               halo=_halo('min_kernel'), color=True, spatial=('min_kernel',)),
+    FilterSpec('max', "Max Filter (Dilation)", 'O', ORDER, [_kernel('max_kernel', "3-7 removes black")],
+               lambda proc, frame, p: proc.max_filter(frame, p['max_kernel']),
+               halo=_halo('max_kernel'), color=True, spatial=('max_kernel',)),
+    FilterSpec('midpoint', "Midpoint Filter", 'P', ORDER, [_kernel('midpoint_kernel', "3-7 optimal")],
+               lambda proc, frame, p: proc.midpoint_filter(frame, p['midpoint_kernel']),
+               halo=_halo('midpoint_kernel'), color=True, spatial=('midpoint_kernel',)),
+]}
+
+# Every mode understood by FilterProcessor.apply_filter
+FILTER_MODES = tuple(FILTERS)
+
+# Pseudo-mode that runs FilterProcessor.chain instead of a single filter
+CHAIN_MODE = 'chain'
+
+
+class FilterChain:
+    """
+    Ordered stack of filters, each with its own parameters.
+
+    The frame is converted to grayscale once and every stage consumes and
+    produces a single-channel uint8 image, so a chain such as
+    median -> GHPF -> Canny never round-trips through BGR. Stages run on the
+    same FilterProcessor and share its scratch buffers and mask cache.
+    """
+
+    def __init__(self, stages=None):
+        self.stages = list(stages or [])
+
+    def add(self, mode, params):
+        """Append a stage, snapshotting the parameters its filter declares."""
+        spec = FILTERS[mode]
+        self.stages.append((mode, {p.key: params[p.key] for p in spec.params}))
+
+    def clear(self):
+        self.stages = []
+
+    def describe(self):
+        return " → ".join(FILTERS[mode].name for mode, _ in self.stages)
+
+    def halo(self):
+        """Combined halo of all stages, or None if any stage can't be tiled as part of a chain."""
+        total = 0
+        for mode, params in self.stages:
+            spec = FILTERS[mode]
+            if spec.halo is None or spec.magnitude is not None:
+                return None
+            total += spec.halo(params)
+        return total
+
+    def scaled(self, scale):
+        """Copy of the chain with every stage's parameters scaled (see scaled_params)."""
+        return FilterChain([(mode, scaled_params(FILTERS[mode], params, scale))
+                            for mode, params in self.stages])
+
+    def run(self, processor, frame):
+        """
+        Run every stage on a frame.
+
+        Large images are tiled as a whole chain (with the summed halo of
+        all stages) when every stage allows it; otherwise each stage decides
+        for itself through FilterProcessor.run_spec.
+        """
+        tiler = processor.tiler
+        if tiler is not None and tiler.worth_tiling(frame):
+            halo = self.halo()
+            if halo is not None:
+                return tiler.map(lambda tile: self.run_stages(processor, tile), frame, halo)
+        return self.run_stages(processor, frame, tiled=True)
+
+    def run_stages(self, processor, frame, tiled=False):
+        """Run the stages on one frame (or tile); tiled=True lets each stage tile itself."""
+        result = processor.to_gray(frame)
+        pool = processor.output_pool
+        for mode, params in self.stages:
+            spec = FILTERS[mode]
+            previous = result
+            if tiled:
+                result = processor.run_spec(spec, result, params)
+            else:
+                result = spec.run(processor, result, params)
+            if pool is not None:
+                # Intermediate results go back to the pool as soon as they're consumed
+                pool.release(previous)
+        return result
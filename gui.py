@@ -0,0 +1,774 @@
+import cv2
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import threading
+import time
+
+from adaptive import TARGET_FPS_CHOICES, AdaptiveScaler
+from display import CanvasView
+from filters import CHAIN_MODE, FILTERS, FilterChain, FilterProcessor, ImageContext
+from pipeline import BufferPool, FramePipeline
+from tiling import TiledExecutor
+from video import VIDEO_EXTENSIONS, process_video
+
+
+class UltimateControlGUI(FilterProcessor):
+    def __init__(self, root):
+        # Filter parameters, active mode and mask cache
+        super().__init__()
+
+        self.root = root
+        self.root.title("Image Processing Studio")
+        self.root.geometry("1700x900")
+        self.root.configure(bg='#2b2b2b')
+
+        # Camera and state
+        self.cap = None
+        self.running = False
+        self.current_frame = None
+        self.processed_frame = None
+
+        # Live pipeline: capture, filter workers, display pump
+        self.pipeline = None
+        self.pipeline_workers = 2
+        self.capture_shape = None  # resolution of the last captured frame
+        self.display_interval = 10  # ms between display pump ticks
+        # A pump tick this late (s) means Tk is backlogged: skip drawing
+        self.display_lag_limit = 0.05
+        self.display_skipped = 0
+        self._pump_due = 0.0
+
+        # Adaptive working resolution: set while a target FPS is selected
+        self.target_fps = None
+        self.scaler = None
+
+        # Video file source: played at its own frame rate, exported offline
+        self.video_path = None
+        self.frame_interval = 0.0
+        self.next_frame_time = 0.0
+        self.export_thread = None
+        self.export_result = None
+
+        # Text of the ⏱ Profile overlay, refreshed with the FPS counter
+        self.profile_text = ""
+
+        # Static image rendering: parameter changes mark the image dirty and
+        # schedule one debounced render instead of polling
+        self.render_delay = 40  # ms of quiet before re-filtering
+        self.render_dirty = False
+        self._render_job = None
+        # Content key and shared intermediates of the loaded image
+        self.image_context = None
+
+        # Large scans (8 MP and up) are filtered in tiles on all cores
+        self.tiler = TiledExecutor()
+
+        self.create_gui()
+
+    def create_gui(self):
+        """Create GUI with ultimate control"""
+
+        # ========== TOP BAR ==========
+        top_bar = tk.Frame(self.root, bg='#1e1e1e', height=70)
+        top_bar.pack(fill='x')
+        top_bar.pack_propagate(False)
+
+        tk.Label(top_bar, text="📷 Image Processing Studio",
+                 bg='#1e1e1e', fg='#ffffff',
+                 font=('Arial', 18, 'bold')).pack(side='left', padx=20)
+
+        # Main buttons
+        btn_frame = tk.Frame(top_bar, bg='#1e1e1e')
+        btn_frame.pack(side='right', padx=20)
+
+        self.camera_btn = tk.Button(btn_frame, text="▶ Camera",
+                                    command=self.toggle_camera,
+                                    bg='#4CAF50', fg='white',
+                                    font=('Arial', 11, 'bold'),
+                                    width=10, height=2, relief='flat')
+        self.camera_btn.pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text="🎞 Video",
+                  command=self.open_video,
+                  bg='#7B1FA2', fg='white',
+                  font=('Arial', 11, 'bold'),
+                  width=10, height=2, relief='flat').pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text="📁 Load",
+                  command=self.load_image,
+                  bg='#2196F3', fg='white',
+                  font=('Arial', 11, 'bold'),
+                  width=10, height=2, relief='flat').pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text="💾 Save",
+                  command=self.save_image,
+                  bg='#FF9800', fg='white',
+                  font=('Arial', 11, 'bold'),
+                  width=10, height=2, relief='flat').pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text="⏺ Export",
+                  command=self.export_video,
+                  bg='#00796B', fg='white',
+                  font=('Arial', 11, 'bold'),
+                  width=10, height=2, relief='flat').pack(side='left', padx=5)
+
+        # ========== MAIN CONTAINER ==========
+        main = tk.Frame(self.root, bg='#2b2b2b')
+        main.pack(fill='both', expand=True, padx=10, pady=10)
+
+        # LEFT: Image display
+        left = tk.Frame(main, bg='#1e1e1e')
+        left.pack(side='left', fill='both', expand=True, padx=(0, 5))
+
+        # Status
+        status_frame = tk.Frame(left, bg='#1e1e1e', height=50)
+        status_frame.pack(fill='x', padx=10, pady=5)
+        status_frame.pack_propagate(False)
+
+        self.status = tk.Label(status_frame, text="Ready | Select a filter to see its controls",
+                               bg='#1e1e1e', fg='#00ff00',
+                               font=('Arial', 11, 'bold'), anchor='w')
+        self.status.pack(side='left', fill='x', expand=True)
+
+        self.fps = tk.Label(status_frame, text="",
+                            bg='#1e1e1e', fg='#ffffff',
+                            font=('Arial', 11))
+        self.fps.pack(side='right')
+
+        self.pipeline_stats = tk.Label(status_frame, text="",
+                                       bg='#1e1e1e', fg='#888888',
+                                       font=('Arial', 9))
+        self.pipeline_stats.pack(side='right', padx=10)
+
+        self.cache_stats = tk.Label(status_frame, text="",
+                                    bg='#1e1e1e', fg='#888888',
+                                    font=('Arial', 9))
+        self.cache_stats.pack(side='right', padx=10)
+
+        tk.Button(status_frame, text="Save Trace",
+                  command=self.export_profile,
+                  bg='#424242', fg='white',
+                  font=('Arial', 9), relief='flat').pack(side='right', padx=2)
+
+        self.profile_btn = tk.Button(status_frame, text="⏱ Profile",
+                                     command=self.toggle_profiler,
+                                     bg='#424242', fg='white',
+                                     font=('Arial', 9), relief='flat')
+        self.profile_btn.pack(side='right', padx=2)
+
+        self.target_var = tk.StringVar(value="Off")
+        target_menu = tk.OptionMenu(status_frame, self.target_var, "Off",
+                                    *(str(fps) for fps in TARGET_FPS_CHOICES),
+                                    command=self.set_target_fps)
+        target_menu.config(bg='#424242', fg='white', font=('Arial', 9),
+                           relief='flat', highlightthickness=0)
+        target_menu.pack(side='right', padx=2)
+        tk.Label(status_frame, text="🎯 Target FPS",
+                 bg='#1e1e1e', fg='#888888',
+                 font=('Arial', 9)).pack(side='right')
+
+        # Canvas
+        self.canvas = tk.Canvas(left, bg='#000000', highlightthickness=0)
+        self.canvas.pack(fill='both', expand=True, padx=10, pady=10)
+        self.view = CanvasView(self.canvas, profiler=self.profiler)
+
+        # RIGHT: Controls
+        right = tk.Frame(main, bg='#1e1e1e', width=600)
+        right.pack(side='right', fill='y')
+        right.pack_propagate(False)
+
+        self.create_controls(right)
+
+        # Bind keys: shortcuts come from the filter registry
+        self.filter_map = {spec.key.lower(): mode for mode, spec in FILTERS.items()}
+        self.filter_map['l'] = CHAIN_MODE
+        self.filter_map['n'] = None
+        self.root.bind('<Key>', self.key_press)
+
+    def create_controls(self, parent):
+        """Create ultimate control panel"""
+
+        tk.Label(parent, text="⚙️ CONTROLS",
+                 bg='#1e1e1e', fg='#ffffff',
+                 font=('Arial', 14, 'bold')).pack(pady=(10, 5))
+
+        tk.Label(parent, text="Every filter has its own dedicated controls below",
+                 bg='#1e1e1e', fg='#ffd54f',
+                 font=('Arial', 9, 'italic')).pack(pady=(0, 10))
+
+        # Scrollable area
+        canvas = tk.Canvas(parent, bg='#1e1e1e', highlightthickness=0)
+        scrollbar = tk.Scrollbar(parent, orient='vertical', command=canvas.yview)
+        scroll_frame = tk.Frame(canvas, bg='#1e1e1e')
+
+        scroll_frame.bind("<Configure>",
+                          lambda e: canvas.configure(scrollregion=canvas.bbox("all")))
+
+        canvas.create_window((0, 0), window=scroll_frame, anchor='nw')
+        canvas.configure(yscrollcommand=scrollbar.set)
+
+        canvas.pack(side='left', fill='both', expand=True, padx=(10, 0))
+        scrollbar.pack(side='right', fill='y')
+
+        # ========== COLOR ==========
+        self.add_section(scroll_frame, "🎨 COLOR (mean, order & frequency filters)")
+        color_frame = tk.Frame(scroll_frame, bg='#2d2d2d', relief='solid', borderwidth=1)
+        color_frame.pack(fill='x', padx=10, pady=5)
+        self.color_var = tk.StringVar(value=self.color_mode)
+        for value, label in (('gray', "Grayscale"), ('bgr', "Per Channel (BGR)"), ('ycrcb', "Luma Only (YCrCb)")):
+            tk.Radiobutton(color_frame, text=label, value=value, variable=self.color_var,
+                           command=self.set_color_mode, indicatoron=0,
+                           bg='#424242', fg='white', selectcolor='#1976D2',
+                           font=('Arial', 9, 'bold'), relief='flat').pack(
+                side='left', fill='x', expand=True, padx=2, pady=5)
+
+        # ========== FILTERS (from the registry) ==========
+        section = None
+        for spec in FILTERS.values():
+            if spec.section != section:
+                section = spec.section
+                self.add_section(scroll_frame, section)
+            self.add_filter_with_controls(scroll_frame, spec.key, spec.name, spec.mode, spec.params)
+
+        # ========== FILTER CHAIN ==========
+        self.add_section(scroll_frame, "🔗 FILTER CHAIN")
+        chain_frame = tk.Frame(scroll_frame, bg='#2d2d2d', relief='solid', borderwidth=1)
+        chain_frame.pack(fill='x', padx=10, pady=5)
+
+        self.chain_label = tk.Label(chain_frame, text="Empty | Select a filter, tune it, then add it",
+                                    bg='#2d2d2d', fg='#ffd54f',
+                                    font=('Arial', 9, 'italic'),
+                                    wraplength=520, justify='left', anchor='w')
+        self.chain_label.pack(fill='x', padx=10, pady=5)
+
+        chain_btns = tk.Frame(chain_frame, bg='#2d2d2d')
+        chain_btns.pack(fill='x', padx=5, pady=(0, 5))
+
+        tk.Button(chain_btns, text="➕ Add Current Filter",
+                  command=self.add_chain_stage,
+                  bg='#388e3c', fg='white',
+                  font=('Arial', 9, 'bold'),
+                  relief='flat').pack(side='left', fill='x', expand=True, padx=2)
+
+        tk.Button(chain_btns, text="L - Run Chain",
+                  command=lambda: self.set_filter(CHAIN_MODE),
+                  bg='#2196F3', fg='white',
+                  font=('Arial', 9, 'bold'),
+                  relief='flat').pack(side='left', fill='x', expand=True, padx=2)
+
+        tk.Button(chain_btns, text="🗑 Clear",
+                  command=self.clear_chain,
+                  bg='#d32f2f', fg='white',
+                  font=('Arial', 9, 'bold'),
+                  relief='flat').pack(side='left', fill='x', expand=True, padx=2)
+
+        # ========== RESET ==========
+        self.add_section(scroll_frame, "🔄 RESET")
+        tk.Button(scroll_frame, text="N - No Filter (Original)",
+                  command=lambda: self.set_filter(None),
+                  bg='#f44336', fg='white',
+                  font=('Arial', 10, 'bold'),
+                  height=2, relief='flat').pack(fill='x', padx=10, pady=5)
+
+        # Info
+        tk.Label(scroll_frame,
+                 text="💡 Every filter has its own controls\n"
+                      "✏️ Click any value to type manually\n"
+                      "⌨️ Keyboard shortcuts still work",
+                 bg='#1e1e1e', fg='#888888',
+                 font=('Arial', 9, 'italic'),
+                 justify='center').pack(pady=20)
+
+    def add_section(self, parent, title):
+        frame = tk.Frame(parent, bg='#0d47a1', height=35)
+        frame.pack(fill='x', padx=10, pady=(15, 5))
+        frame.pack_propagate(False)
+        tk.Label(frame, text=title, bg='#0d47a1', fg='#ffffff',
+                 font=('Arial', 10, 'bold')).pack(anchor='w', padx=10, pady=8)
+
+    def add_filter_with_controls(self, parent, key, name, mode, controls):
+        """Add filter button with its dedicated controls"""
+        main_frame = tk.Frame(parent, bg='#2d2d2d', relief='solid', borderwidth=1)
+        main_frame.pack(fill='x', padx=10, pady=5)
+
+        # Filter button
+        btn_frame = tk.Frame(main_frame, bg='#2d2d2d')
+        btn_frame.pack(fill='x', padx=5, pady=5)
+
+        tk.Label(btn_frame, text=key, bg='#000000', fg='#00ff00',
+                 font=('Consolas', 11, 'bold'),
+                 width=4).pack(side='left', padx=5)
+
+        tk.Button(btn_frame, text=name,
+                  command=lambda: self.set_filter(mode),
+                  bg='#424242', fg='#ffffff',
+                  font=('Arial', 10, 'bold'),
+                  relief='flat', anchor='w').pack(side='left', fill='x', expand=True, padx=5)
+
+        # Controls for this filter
+        if controls:
+            ctrl_container = tk.Frame(main_frame, bg='#363636')
+            ctrl_container.pack(fill='x', padx=5, pady=(0, 5))
+
+            for param_key, label, min_val, max_val, step, tip in controls:
+                self.add_inline_param(ctrl_container, label, param_key, min_val, max_val, step, tip)
+
+    def add_inline_param(self, parent, label, param_key, min_val, max_val, step, tip):
+        """Add inline parameter control"""
+        frame = tk.Frame(parent, bg='#363636')
+        frame.pack(fill='x', padx=5, pady=3)
+
+        # Label
+        label_frame = tk.Frame(frame, bg='#363636')
+        label_frame.pack(side='left', fill='x', expand=True)
+
+        tk.Label(label_frame, text=label + ":", bg='#363636', fg='#ffffff',
+                 font=('Arial', 8, 'bold'), anchor='w').pack(side='left')
+
+        tk.Label(label_frame, text=f"💡 {tip}",
+                 bg='#363636', fg='#ffd54f',
+                 font=('Arial', 7, 'italic'), anchor='w').pack(side='left', padx=5)
+
+        # Controls
+        ctrl = tk.Frame(frame, bg='#363636')
+        ctrl.pack(side='right')
+
+        # Minus
+        tk.Button(ctrl, text="−",
+                  command=lambda: self.adjust_param(param_key, -step, min_val, max_val),
+                  bg='#d32f2f', fg='white',
+                  font=('Arial', 9, 'bold'),
+                  width=2, relief='flat').pack(side='left', padx=1)
+
+        # Entry
+        entry = tk.Entry(ctrl,
+                         bg='#000000', fg='#00ff00',
+                         font=('Consolas', 9, 'bold'),
+                         width=7, justify='center',
+                         relief='flat', insertbackground='#00ff00')
+        entry.pack(side='left', padx=3)
+        entry.insert(0, str(self.params[param_key]))
+
+        entry.bind('<Return>', lambda e: self.manual_entry(param_key, entry, min_val, max_val))
+        entry.bind('<FocusOut>', lambda e: self.manual_entry(param_key, entry, min_val, max_val))
+
+        setattr(self, f'entry_{param_key}', entry)
+
+        # Plus
+        tk.Button(ctrl, text="+",
+                  command=lambda: self.adjust_param(param_key, step, min_val, max_val),
+                  bg='#388e3c', fg='white',
+                  font=('Arial', 9, 'bold'),
+                  width=2, relief='flat').pack(side='left', padx=1)
+
+    def manual_entry(self, param_key, entry, min_val, max_val):
+        try:
+            value = entry.get()
+
+            if isinstance(self.params[param_key], float):
+                # Kept at the precision the entry shows, like adjust_param
+                new_val = round(float(value), 2)
+            else:
+                new_val = int(float(value))
+                if 'kernel' in param_key and new_val % 2 == 0:
+                    new_val += 1
+
+            new_val = max(min_val, min(new_val, max_val))
+            if new_val != self.params[param_key]:
+                self.params[param_key] = new_val
+                self.request_render()
+
+            if isinstance(new_val, float):
+                entry.delete(0, tk.END)
+                entry.insert(0, f"{new_val:.2f}")
+            else:
+                entry.delete(0, tk.END)
+                entry.insert(0, str(new_val))
+
+        except ValueError:
+            current = self.params[param_key]
+            entry.delete(0, tk.END)
+            if isinstance(current, float):
+                entry.insert(0, f"{current:.2f}")
+            else:
+                entry.insert(0, str(current))
+            messagebox.showwarning("Invalid", f"Enter number between {min_val} and {max_val}")
+
+    def adjust_param(self, key, change, min_val, max_val):
+        current = self.params[key]
+        new_val = current + change
+        if isinstance(new_val, float):
+            # Round away float drift (1.5 + 0.2 - 0.2 != 1.5), which would
+            # give an unchanged setting a new ResultCache key
+            new_val = round(new_val, 2)
+
+        if 'kernel' in key and isinstance(new_val, int) and new_val % 2 == 0:
+            new_val += 1 if change > 0 else -1
+
+        new_val = max(min_val, min(new_val, max_val))
+        if new_val == current:
+            return
+        self.params[key] = new_val
+        self.request_render()
+
+        entry = getattr(self, f'entry_{key}')
+        entry.delete(0, tk.END)
+        if isinstance(new_val, float):
+            entry.insert(0, f"{new_val:.2f}")
+        else:
+            entry.insert(0, str(new_val))
+
+    def add_chain_stage(self):
+        """Append the active filter, with its current parameters, to the chain"""
+        if self.current_mode not in FILTERS:
+            messagebox.showwarning("Chain", "Select a filter first, then add it to the chain")
+            return
+        self.chain.add(self.current_mode, self.params)
+        self.chain_label.config(text=self.chain.describe())
+        if self.current_mode == CHAIN_MODE:
+            self.request_render()
+
+    def clear_chain(self):
+        self.chain.clear()
+        self.chain_label.config(text="Empty | Select a filter, tune it, then add it")
+        if self.current_mode == CHAIN_MODE:
+            self.set_filter(CHAIN_MODE)
+
+    def set_filter(self, mode):
+        self.current_mode = mode
+        if mode == CHAIN_MODE:
+            self.status.config(text=f"Active: Chain | {self.chain.describe() or 'empty'}")
+        elif mode:
+            self.status.config(text=f"Active: {mode.replace('_', ' ').title()} | Adjust its controls above")
+        else:
+            self.status.config(text="Ready | Select a filter to see its controls")
+
+        self.request_render()
+
+    def set_color_mode(self):
+        self.color_mode = self.color_var.get()
+        self.request_render()
+
+    def request_render(self):
+        """
+        Mark the loaded image dirty and schedule a debounced re-render.
+
+        Each call cancels the pending render, so a burst of slider clicks or
+        key presses filters the image once, after `render_delay` ms of quiet.
+        While the camera runs the pipeline picks up changes on its own.
+        """
+        if self.current_frame is None or self.running:
+            return
+        self.render_dirty = True
+        if self._render_job is not None:
+            self.root.after_cancel(self._render_job)
+        self._render_job = self.root.after(self.render_delay, self.render_static_image)
+
+    def render_static_image(self):
+        """Filter and show the loaded image if anything changed since the last render"""
+        self._render_job = None
+        if not self.render_dirty or self.current_frame is None or self.running:
+            return
+        self.render_dirty = False
+        self.processed_frame = self.apply_filter(self.current_frame, self.image_context)
+        self.update_canvas(self.processed_frame)
+        self.cache_stats.config(text=self.result_cache.stats_text())
+
+    def cancel_render(self):
+        self.render_dirty = False
+        if self._render_job is not None:
+            self.root.after_cancel(self._render_job)
+            self._render_job = None
+
+    def key_press(self, event):
+        key = event.char.lower()
+
+        if key in self.filter_map:
+            self.set_filter(self.filter_map[key])
+        elif key == 'q':
+            self.root.quit()
+
+    def toggle_camera(self):
+        if not self.running:
+            self.start_camera()
+        else:
+            self.stop_camera()
+
+    def start_camera(self, source=0):
+        """Start the live pipeline on the camera (0) or a video file path."""
+        try:
+            self.cap = cv2.VideoCapture(source)
+            if not self.cap.isOpened():
+                messagebox.showerror("Error", "Cannot open camera" if source == 0
+                                     else f"Cannot open video: {source}")
+                return
+
+            # Video files play at their own frame rate; the camera paces itself
+            fps = self.cap.get(cv2.CAP_PROP_FPS) if source != 0 else 0
+            self.frame_interval = 1.0 / fps if fps > 0 else 0.0
+            self.next_frame_time = time.perf_counter()
+
+            self.cancel_render()
+            self.image_context = None
+            self.cache_stats.config(text="")
+            self.running = True
+            self.camera_btn.config(text="⏹ Stop", bg='#f44336')
+
+            # Captured frames and filter results are recycled through a
+            # per-resolution pool once the display is done with them
+            self.output_pool = BufferPool()
+            self.capture_shape = None
+
+            # Capture thread -> filter workers -> display pump on the Tk thread
+            self.scaler = AdaptiveScaler(self.target_fps) if self.target_fps else None
+            self.pipeline = FramePipeline(self.read_camera, self.filter_live,
+                                          workers=self.pipeline_workers)
+            self.pipeline.start()
+            self.fps_time = time.time()
+            self.fps_count = 0
+            self.display_skipped = 0
+            self._pump_due = time.perf_counter()
+            self.camera_loop()
+
+        except Exception as e:
+            messagebox.showerror("Error", str(e))
+
+    def stop_camera(self):
+        self.running = False
+        if self.pipeline:
+            self.pipeline.stop()
+            self.pipeline = None
+        # processed_frame stays valid for saving; it just isn't recycled anymore
+        self.output_pool = None
+        self.scaler = None
+        if self.cap:
+            self.cap.release()
+        self.camera_btn.config(text="▶ Camera", bg='#4CAF50')
+        self.pipeline_stats.config(text="")
+
+    def read_camera(self):
+        """Capture stage: runs on the pipeline's capture thread."""
+        if self.frame_interval:
+            delay = self.next_frame_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self.next_frame_time = max(self.next_frame_time, time.perf_counter()) + self.frame_interval
+        pool = self.output_pool
+        with self.profiler.stage('capture'):
+            if pool is None or self.capture_shape is None:
+                ret, frame = self.cap.read()
+            else:
+                # Decode into a recycled buffer of the same resolution
+                ret, frame = self.cap.read(pool.acquire(self.capture_shape))
+        if not ret:
+            return None
+        self.capture_shape = frame.shape
+        return frame
+
+    def filter_live(self, frame):
+        """
+        Filter stage: runs on the pipeline's worker threads.
+
+        With a target FPS the frame is shrunk to the scaler's working scale
+        before filtering (window sizes follow, see apply_filter's `scale`)
+        and the filter latency is fed back to the scaler. The display
+        scales the smaller result up to the canvas like any other frame.
+        """
+        scaler = self.scaler
+        if scaler is None or self.current_mode is None:
+            return self.apply_filter(frame)
+
+        scale = scaler.scale
+        start = time.perf_counter()
+        if scale == 1.0:
+            result = self.apply_filter(frame)
+        else:
+            h, w = frame.shape[:2]
+            shape = (max(int(h * scale), 1), max(int(w * scale), 1)) + frame.shape[2:]
+            pool = self.output_pool
+            small = pool.acquire(shape) if pool is not None else None
+            with self.profiler.stage('downscale'):
+                small = cv2.resize(frame, (shape[1], shape[0]), dst=small, interpolation=cv2.INTER_AREA)
+            result = self.apply_filter(small, scale=scale)
+            if pool is not None and result is not small:
+                pool.release(small)
+        scaler.update(time.perf_counter() - start, scale)
+        return result
+
+    def set_target_fps(self, value):
+        """Hold a target FPS on live sources by adapting the working resolution, or stop (Off)."""
+        self.target_fps = int(value) if value != "Off" else None
+        # Workers pick up the new scaler (or None) on their next frame
+        self.scaler = AdaptiveScaler(self.target_fps) if self.target_fps and self.running else None
+
+    def toggle_profiler(self):
+        """Start timing each stage and show the per-stage overlay, or stop."""
+        self.profiler.enabled = not self.profiler.enabled
+        self.profiler.reset()
+        self.profile_text = ""
+        self.profile_btn.config(bg='#F57C00' if self.profiler.enabled else '#424242')
+        if self.processed_frame is not None:
+            self.update_canvas(self.processed_frame)
+
+    def export_profile(self):
+        if not self.profiler.summary():
+            messagebox.showwarning("Profiler", "No timings yet: enable ⏱ Profile and run some frames")
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".json",
+                                            filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+        if path:
+            self.profiler.export(path)
+
+    def open_video(self):
+        path = filedialog.askopenfilename(
+            filetypes=[("Videos", " ".join(f"*{ext}" for ext in VIDEO_EXTENSIONS)), ("All", "*.*")])
+        if path:
+            self.stop_camera()
+            self.video_path = path
+            self.start_camera(path)
+
+    def export_video(self):
+        """Filter a whole video file to disk in the background, as fast as possible."""
+        if self.export_thread is not None:
+            messagebox.showinfo("Export", "An export is already running")
+            return
+        src = self.video_path or filedialog.askopenfilename(
+            filetypes=[("Videos", " ".join(f"*{ext}" for ext in VIDEO_EXTENSIONS)), ("All", "*.*")])
+        if not src:
+            return
+        dst = filedialog.asksaveasfilename(defaultextension=".mp4",
+                                           filetypes=[("MP4", "*.mp4"), ("AVI", "*.avi")])
+        if not dst:
+            return
+
+        # Snapshot the filter so tuning the live view doesn't change the export
+        processor = FilterProcessor(self.params, self.current_mode)
+        processor.chain = FilterChain(self.chain.stages)
+        processor.color_mode = self.color_mode
+        # A failing filter must fail the export (reported by poll_export),
+        # not write unfiltered frames
+        processor.strict = True
+
+        def run():
+            try:
+                self.export_result = process_video(processor, src, dst, workers=self.pipeline_workers)
+            except Exception as e:
+                self.export_result = e
+
+        self.export_result = None
+        self.export_thread = threading.Thread(target=run, daemon=True)
+        self.export_thread.start()
+        self.status.config(text=f"Exporting {src} ...")
+        self.root.after(200, self.poll_export)
+
+    def poll_export(self):
+        """Main-thread check for export completion; Tk is never touched from the export thread."""
+        if self.export_thread.is_alive():
+            self.root.after(200, self.poll_export)
+            return
+        self.export_thread = None
+        result = self.export_result
+        if isinstance(result, Exception):
+            self.status.config(text="Export failed")
+            messagebox.showerror("Export", str(result))
+        else:
+            frames, elapsed = result
+            rate = frames / elapsed if elapsed > 0 else 0.0
+            self.status.config(text=f"Exported {frames} frames in {elapsed:.1f}s ({rate:.1f} frames/sec)")
+
+    def camera_loop(self):
+        """Display pump: runs on the Tk main thread via root.after."""
+        if not self.running or self.pipeline is None:
+            return
+
+        if self.pipeline.exhausted:
+            self.stop_camera()
+            return
+
+        # A tick that fires well after it was due means drawing or event
+        # handling can't keep up: take the newest result but don't draw it,
+        # so the UI stays responsive
+        behind = time.perf_counter() - self._pump_due > self.display_lag_limit
+
+        result = self.pipeline.latest()
+        if result is not None:
+            previous = (self.current_frame, self.processed_frame)
+            self.current_frame, self.processed_frame = result
+            for buf in previous:
+                if buf is not self.current_frame and buf is not self.processed_frame:
+                    self.output_pool.release(buf)
+            if behind:
+                self.display_skipped += 1
+            else:
+                self.update_canvas(self.processed_frame)
+
+            self.fps_count += 1
+            if self.fps_count % 10 == 0:
+                fps_val = 10 / (time.time() - self.fps_time)
+                self.fps.config(text=f"FPS: {fps_val:.1f}")
+                stats = f"{self.pipeline.stats_text()} | Skipped {self.display_skipped}"
+                if self.scaler is not None:
+                    stats += f" | Scale {self.scaler.scale:.0%}"
+                self.pipeline_stats.config(text=stats)
+                self.fps_time = time.time()
+                if self.profiler.enabled:
+                    self.profile_text = self.profiler.overlay_text()
+
+        self._pump_due = time.perf_counter() + self.display_interval / 1000
+        self.root.after(self.display_interval, self.camera_loop)
+
+    def load_image(self):
+        path = filedialog.askopenfilename(
+            filetypes=[("Images", "*.jpg *.jpeg *.png *.bmp"), ("All", "*.*")])
+
+        if path:
+            self.stop_camera()
+            img = cv2.imread(path)
+            if img is not None:
+                self.current_frame = img
+                self.image_context = ImageContext(img)
+                # Render right away; later changes go through request_render
+                self.cancel_render()
+                self.render_dirty = True
+                self.render_static_image()
+
+    def save_image(self):
+        if self.processed_frame is None:
+            messagebox.showwarning("Warning", "No image to save")
+            return
+
+        path = filedialog.asksaveasfilename(
+            defaultextension=".png",
+            filetypes=[("PNG", "*.png"), ("JPEG", "*.jpg")])
+
+        if path:
+            cv2.imwrite(path, self.processed_frame)
+            messagebox.showinfo("Success", "Saved!")
+
+    def update_canvas(self, frame):
+        if frame is None:
+            return
+
+        if not self.view.show(frame):
+            # Canvas not laid out yet
+            self.root.after(100, lambda: self.update_canvas(frame))
+            return
+
+        if self.profiler.enabled and not self.running:
+            # Static images render rarely, so refresh their overlay every time
+            self.profile_text = self.profiler.overlay_text()
+        self.view.set_overlay(self.profile_text if self.profiler.enabled else "")
+
+
+def run_gui():
+    """Open the Tk application (needs a display)."""
+    root = tk.Tk()
+    app = UltimateControlGUI(root)
+
+    def on_close():
+        app.stop_camera()
+        app.tiler.shutdown()
+        root.destroy()
+
+    root.protocol("WM_DELETE_WINDOW", on_close)
+    root.mainloop()
@@ -0,0 +1,272 @@
+"""
+Backends for the filter steps that have no OpenCV primitive.
+
+Canny's non-maximum suppression and hysteresis, the contraharmonic mean's
+powers and the midpoint filter's combine are written as NumPy passes. With
+numba installed the same steps also exist as compiled loops that run each
+pixel once, parallelized over rows where rows are independent (hysteresis
+is inherently sequential: each row depends on the promotions of the one
+above, so it is compiled but not parallel). FilterProcessor.backend picks
+the implementation; both give the same results (see
+tests/test_backends.py).
+"""
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+try:
+    import numba
+    prange = numba.prange
+except ImportError:
+    numba = None
+    # The loop kernels below still run (slowly) as plain Python, for tests
+    prange = range
+
+# Accepted by get_backend; 'auto' is numba when installed, numpy otherwise
+BACKEND_NAMES = ('auto', 'numpy', 'numba')
+
+Backend = namedtuple('Backend', 'name non_max_suppression hysteresis contraharmonic_powers midpoint')
+
+
+def get_backend(name='auto'):
+    """The kernels of backend `name` (one of BACKEND_NAMES)."""
+    if name == 'auto':
+        name = 'numba' if numba is not None else 'numpy'
+    if name == 'numpy':
+        return NUMPY_BACKEND
+    if name == 'numba':
+        if numba is None:
+            raise ValueError("the numba backend requires the numba package")
+        return NUMBA_BACKEND
+    raise ValueError(f"unknown backend '{name}' (expected one of {', '.join(BACKEND_NAMES)})")
+
+
+def available_backends():
+    """Names of the backends usable here, numpy first."""
+    return ['numpy'] + (['numba'] if numba is not None else [])
+
+
+# ========== NUMPY ==========
+
+def _zeros(shape, dtype, out):
+    """`out` cleared, or a new zeroed array if it is None."""
+    if out is None:
+        return np.zeros(shape, dtype)
+    out.fill(0)
+    return out
+
+
+def _copy(array, out):
+    """Copy of `array`, into `out` if given."""
+    if out is None:
+        return array.copy()
+    np.copyto(out, array)
+    return out
+
+
+def _numpy_non_max_suppression(mag, ang, out=None):
+    """
+    Keep only pixels that are local maxima along the gradient direction.
+
+    The angle (0-180 degrees) is quantized into four direction bins and
+    each interior pixel is compared against its two neighbours in that
+    direction using shifted views of the magnitude array. Border pixels
+    are always suppressed. The float32 result goes into `out` if given.
+    """
+    M, N = mag.shape
+    Z = _zeros(mag.shape, np.float32, out)
+    if M < 3 or N < 3:
+        return Z
+
+    center = mag[1:-1, 1:-1]
+    angle = ang[1:-1, 1:-1]
+
+    # Direction bins (disjoint; anything left over, including NaN angles,
+    # falls into the 135 degree bin)
+    bins = [
+        ((0 <= angle) & (angle < 22.5)) | ((157.5 <= angle) & (angle <= 180)),
+        (22.5 <= angle) & (angle < 67.5),
+        (67.5 <= angle) & (angle < 112.5),
+    ]
+    # Larger of the two neighbours along each direction, filled in bin by
+    # bin through one temporary instead of one full array per direction
+    neighbours = np.maximum(mag[:-2, :-2], mag[2:, 2:])
+    pair = np.empty_like(neighbours)
+    for in_bin, (q, r) in zip(bins, [(mag[1:-1, 2:], mag[1:-1, :-2]),
+                                     (mag[2:, :-2], mag[:-2, 2:]),
+                                     (mag[2:, 1:-1], mag[:-2, 1:-1])]):
+        np.copyto(neighbours, np.maximum(q, r, out=pair), where=in_bin)
+
+    keep = center >= neighbours
+    Z[1:-1, 1:-1][keep] = center[keep]
+    return Z
+
+
+def _numpy_hysteresis(res, strong, weak, out=None):
+    """
+    Edge tracking by hysteresis on a double-thresholded image.
+
+    Weak interior pixels are visited in raster order: a weak pixel becomes
+    strong when its 3x3 neighbourhood already holds a strong pixel,
+    otherwise it is dropped. Promotions therefore spread to the right and
+    downwards within a single pass. Rows are processed one at a time with
+    vectorized operations: the first weak pixel of a run that touches a
+    strong pixel (original, or promoted in the row above) promotes every
+    weak pixel after it in the same run. The result goes into `out` if
+    given.
+    """
+    M, N = res.shape
+    result = _copy(res, out)
+    if M < 3 or N < 3:
+        return result
+
+    weak_mask = res == weak
+    weak_mask[:, 0] = False
+    weak_mask[:, -1] = False
+    near_strong = cv2.dilate((res == strong).astype(np.uint8),
+                             np.ones((3, 3), np.uint8)) > 0
+
+    cols = np.arange(N)
+    prev = np.zeros(N, dtype=bool)
+    for i in range(1, M - 1):
+        candidates = weak_mask[i]
+        if not candidates.any():
+            prev[:] = False
+            continue
+
+        # Strong neighbours: original strong pixels anywhere in the 3x3
+        # window, plus pixels promoted in the row above
+        seed = near_strong[i].copy()
+        seed[1:] |= prev[:-1]
+        seed |= prev
+        seed[:-1] |= prev[1:]
+        seed &= candidates
+
+        # Within a run of weak pixels, everything from the first seed on
+        # is promoted through its (already promoted) left neighbour
+        last_seed = np.maximum.accumulate(np.where(seed, cols, -1))
+        last_break = np.maximum.accumulate(np.where(candidates, -1, cols))
+        promoted = candidates & (last_seed > last_break)
+
+        row = result[i]
+        row[candidates] = 0
+        row[promoted] = strong
+        prev = promoted
+
+    return result
+
+
+def _numpy_contraharmonic_powers(g, Q, powered):
+    """Set `powered` to g^Q and `g` to g^(Q+1), in place (float32)."""
+    np.power(g, Q, out=powered)
+    np.multiply(powered, g, out=g)
+
+
+def _numpy_midpoint(min_f, max_f, out):
+    """floor((min + max) / 2) into `out` (uint8); `min_f` is overwritten."""
+    # Without widening: common bits plus half the differing ones
+    midpoint = cv2.bitwise_and(min_f, max_f, dst=out)
+    diff = cv2.bitwise_xor(min_f, max_f, dst=min_f)
+    np.right_shift(diff, 1, out=diff)
+    return cv2.add(midpoint, diff, dst=midpoint)
+
+
+NUMPY_BACKEND = Backend('numpy', _numpy_non_max_suppression, _numpy_hysteresis,
+                        _numpy_contraharmonic_powers, _numpy_midpoint)
+
+
+# ========== NUMBA ==========
+# Same contracts as the NumPy versions above. The per-pixel loops are plain
+# Python functions, compiled by _loop_backend; with numba they are compiled
+# on first use and cached on disk (cache=True), so only the first run pays
+# for compilation.
+
+def _nms_rows(mag, ang, Z):
+    M, N = mag.shape
+    for i in prange(1, M - 1):
+        for j in range(1, N - 1):
+            a = ang[i, j]
+            if (0 <= a < 22.5) or (157.5 <= a <= 180):
+                q, r = mag[i, j + 1], mag[i, j - 1]
+            elif 22.5 <= a < 67.5:
+                q, r = mag[i + 1, j - 1], mag[i - 1, j + 1]
+            elif 67.5 <= a < 112.5:
+                q, r = mag[i + 1, j], mag[i - 1, j]
+            else:
+                q, r = mag[i - 1, j - 1], mag[i + 1, j + 1]
+            # Two comparisons, not max(q, r): a NaN neighbour must suppress
+            if mag[i, j] >= q and mag[i, j] >= r:
+                Z[i, j] = mag[i, j]
+
+
+def _hysteresis_scan(res, result, strong, weak):
+    M, N = res.shape
+    for i in range(1, M - 1):
+        for j in range(1, N - 1):
+            if res[i, j] != weak:
+                continue
+            # Promoted or strong pixels before this one in raster order
+            # (result), original strong pixels after it (res)
+            found = (result[i - 1, j - 1] == strong or result[i - 1, j] == strong
+                     or result[i - 1, j + 1] == strong or result[i, j - 1] == strong
+                     or res[i, j + 1] == strong or res[i + 1, j - 1] == strong
+                     or res[i + 1, j] == strong or res[i + 1, j + 1] == strong)
+            result[i, j] = strong if found else 0
+
+
+def _powers_rows(g, Q, powered):
+    M, N = g.shape
+    for i in prange(M):
+        for j in range(N):
+            p = g[i, j] ** Q
+            powered[i, j] = p
+            g[i, j] = p * g[i, j]
+
+
+def _midpoint_rows(min_f, max_f, out):
+    M, N = min_f.shape
+    for i in prange(M):
+        for j in range(N):
+            out[i, j] = (np.int32(min_f[i, j]) + np.int32(max_f[i, j])) >> 1
+
+
+def _loop_backend(name, jit):
+    """
+    Backend running the loop kernels compiled by `jit(func, parallel)`.
+
+    With numba.njit this is the numba backend; with a jit that returns the
+    function unchanged it runs the same loop bodies as plain Python.
+    """
+    nms_rows = jit(_nms_rows, parallel=True)
+    hysteresis_scan = jit(_hysteresis_scan, parallel=False)
+    powers_rows = jit(_powers_rows, parallel=True)
+    midpoint_rows = jit(_midpoint_rows, parallel=True)
+
+    def non_max_suppression(mag, ang, out=None):
+        Z = _zeros(mag.shape, np.float32, out)
+        if mag.shape[0] >= 3 and mag.shape[1] >= 3:
+            nms_rows(mag, ang, Z)
+        return Z
+
+    def hysteresis(res, strong, weak, out=None):
+        result = _copy(res, out)
+        if res.shape[0] >= 3 and res.shape[1] >= 3:
+            hysteresis_scan(res, result, np.uint8(strong), np.uint8(weak))
+        return result
+
+    def contraharmonic_powers(g, Q, powered):
+        powers_rows(g, np.float32(Q), powered)
+
+    def midpoint(min_f, max_f, out):
+        midpoint_rows(min_f, max_f, out)
+        return out
+
+    return Backend(name, non_max_suppression, hysteresis, contraharmonic_powers, midpoint)
+
+
+if numba is not None:
+    NUMBA_BACKEND = _loop_backend(
+        'numba', lambda func, parallel: numba.njit(parallel=parallel, cache=True)(func))
+else:
+    NUMBA_BACKEND = None
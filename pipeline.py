@@ -0,0 +1,291 @@
+import queue
+import threading
+import weakref
+from collections import deque
+
+import numpy as np
+
+
+class DropOldestQueue:
+    """
+    Bounded FIFO queue whose put never blocks.
+
+    When the queue is full the oldest item is discarded to make room, so
+    consumers always see the most recent items. Discarded items are counted
+    in `dropped`.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._items)
+
+    def put(self, item):
+        with self._cond:
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Remove and return the oldest item, raising queue.Empty on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items, timeout):
+                raise queue.Empty
+            return self._items.popleft()
+
+    def get_latest(self):
+        """Remove everything and return the newest item (None if empty)."""
+        with self._cond:
+            if not self._items:
+                return None
+            item = self._items.pop()
+            self.dropped += len(self._items)
+            self._items.clear()
+            return item
+
+
+class BufferPool:
+    """
+    Reusable frame arrays, kept per (shape, dtype), i.e. per resolution.
+
+    acquire() hands out a free buffer of the requested shape and dtype,
+    allocating only when none is free; release() gives it back once nothing
+    reads it anymore. Buffers the pool didn't create, and buffers that are
+    already free, are ignored by release, so a consumer can release every
+    frame it is done with without tracking where it came from. Buffers that
+    are never released (frames dropped along the pipeline) are simply
+    garbage collected. At most `max_free` buffers are kept per shape.
+    """
+
+    def __init__(self, max_free=8):
+        self.max_free = max_free
+        self.allocated = 0
+        self._free = {}
+        self._free_ids = set()
+        self._owned = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def acquire(self, shape, dtype=np.uint8):
+        key = (tuple(shape), np.dtype(dtype))
+        with self._lock:
+            free = self._free.get(key)
+            if free:
+                buf = free.pop()
+                self._free_ids.discard(id(buf))
+                return buf
+            self.allocated += 1
+        buf = np.empty(shape, dtype)
+        with self._lock:
+            self._owned[id(buf)] = buf
+        return buf
+
+    def release(self, buf):
+        if buf is None:
+            return
+        with self._lock:
+            if self._owned.get(id(buf)) is not buf or id(buf) in self._free_ids:
+                return
+            free = self._free.setdefault((buf.shape, buf.dtype), [])
+            if len(free) < self.max_free:
+                free.append(buf)
+                self._free_ids.add(id(buf))
+
+    def clear(self):
+        with self._lock:
+            self._free.clear()
+            self._free_ids.clear()
+
+
+class FramePipeline:
+    """
+    Three-stage frame pipeline: capture thread -> processing workers -> consumer.
+
+    `read_frame()` is called in a loop on the capture thread and returns the
+    next frame, or None when the source is exhausted. Frames are handed to
+    a pool of worker threads running `process(frame)`. The consumer (the Tk
+    display pump, on the main thread) polls `latest()`. Stages are joined by
+    DropOldestQueue, so a slow filter drops frames instead of stalling
+    capture, and results that arrive out of order are discarded as stale.
+    """
+
+    def __init__(self, read_frame, process, workers=2, queue_size=2):
+        self.read_frame = read_frame
+        self.process = process
+        self.workers = workers
+        self.captured = DropOldestQueue(queue_size)
+        self.results = DropOldestQueue(queue_size)
+        self.stale = 0
+        self.finished = False
+        self._running = False
+        self._threads = []
+        self._last_seq = -1
+
+    @property
+    def running(self):
+        return self._running
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._capture_loop, daemon=True)]
+        self._threads += [threading.Thread(target=self._process_loop, daemon=True)
+                          for _ in range(self.workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop all stages and wait for the threads, so the source can be released."""
+        self._running = False
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def latest(self):
+        """Newest processed (frame, processed) pair not yet returned, or None."""
+        item = self.results.get_latest()
+        if item is None:
+            return None
+        seq, frame, processed = item
+        if seq <= self._last_seq:
+            self.stale += 1
+            return None
+        self._last_seq = seq
+        return frame, processed
+
+    @property
+    def exhausted(self):
+        """True once the source ran out and every frame has been consumed."""
+        return (self.finished and not len(self.results)
+                and not any(thread.is_alive() for thread in self._threads))
+
+    @property
+    def dropped(self):
+        return self.captured.dropped + self.results.dropped + self.stale
+
+    def stats_text(self):
+        return (f"Queue {len(self.captured)}/{self.captured.maxsize} → "
+                f"{len(self.results)}/{self.results.maxsize} | Dropped {self.dropped}")
+
+    def _capture_loop(self):
+        seq = 0
+        while self._running:
+            frame = self.read_frame()
+            if frame is None:
+                self.finished = True
+                break
+            self.captured.put((seq, frame))
+            seq += 1
+
+    def _process_loop(self):
+        while self._running:
+            try:
+                seq, frame = self.captured.get(timeout=0.1)
+            except queue.Empty:
+                if self.finished:
+                    break
+                continue
+            self.results.put((seq, frame, self.process(frame)))
+
+
+def run_ordered(read_frame, process, write, workers=1, queue_size=8):
+    """
+    Lossless three-stage pipeline for offline processing.
+
+    A decode thread calls `read_frame()` until it returns None, `workers`
+    filter threads run `process(frame)`, and the calling thread passes
+    results to `write(result)` in source order. Unlike FramePipeline nothing
+    is dropped: stages are joined by blocking bounded queues, so decoding
+    prefetches at most `queue_size` frames ahead and a slow stage applies
+    back-pressure. An exception in any stage stops the others and is
+    re-raised. Returns the number of frames written.
+    """
+    decoded = queue.Queue(queue_size)
+    processed = queue.Queue(queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return None
+
+    def decode_loop():
+        seq = 0
+        try:
+            while not stop.is_set():
+                frame = read_frame()
+                if frame is None:
+                    break
+                if not put(decoded, (seq, frame)):
+                    return
+                seq += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            # One end-of-stream marker per filter thread
+            for _ in range(workers):
+                put(decoded, None)
+
+    def filter_loop():
+        try:
+            while True:
+                item = get(decoded)
+                if item is None:
+                    break
+                seq, frame = item
+                if not put(processed, (seq, process(frame))):
+                    break
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            put(processed, None)
+
+    threads = [threading.Thread(target=decode_loop, daemon=True)]
+    threads += [threading.Thread(target=filter_loop, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Encode stage: results can arrive out of order from several workers
+    written, finished, pending = 0, 0, {}
+    try:
+        while finished < workers:
+            item = get(processed)
+            if item is None:
+                if stop.is_set():
+                    break
+                finished += 1
+                continue
+            seq, result = item
+            pending[seq] = result
+            while written in pending:
+                write(pending.pop(written))
+                written += 1
+    except Exception as e:
+        errors.append(e)
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[0]
+    return written
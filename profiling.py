@@ -0,0 +1,111 @@
+"""
+Per-stage timing for the live view.
+
+FilterProcessor and the GUI wrap each hot-path stage (capture, grayscale
+conversion, filter, resize, PIL conversion, PhotoImage, canvas drawing) in
+`profiler.stage(name)`. While the profiler is disabled that returns a
+shared no-op context manager, so the instrumentation costs one method call
+per stage.
+"""
+import contextlib
+import csv
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+# Upper bucket edges of the exported histograms, in ms
+HISTOGRAM_EDGES_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, float('inf'))
+
+_DISABLED = contextlib.nullcontext()
+
+
+class _StageTimer:
+    __slots__ = ('samples', 'start')
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        # deque.append is atomic, so stages can record from any thread
+        self.samples.append(time.perf_counter() - self.start)
+
+
+class StageProfiler:
+    """
+    Rolling window of the last `window` durations of each named stage.
+
+    Stages appear in the order they are first recorded. Statistics and
+    histograms are computed from the window on demand, off the hot path.
+    """
+
+    def __init__(self, window=256, enabled=False):
+        self.window = window
+        self.enabled = enabled
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager timing one run of stage `name`."""
+        if not self.enabled:
+            return _DISABLED
+        samples = self._stages.get(name)
+        if samples is None:
+            with self._lock:
+                samples = self._stages.setdefault(name, deque(maxlen=self.window))
+        return _StageTimer(samples)
+
+    def reset(self):
+        with self._lock:
+            self._stages = {}
+
+    def samples_ms(self, name):
+        return np.array(self._stages.get(name, ()), np.float64) * 1000
+
+    def summary(self):
+        """{stage: {count, mean_ms, p50_ms, p95_ms, max_ms, histogram}} over the current window."""
+        summary = {}
+        for name in list(self._stages):
+            ms = self.samples_ms(name)
+            if not len(ms):
+                continue
+            counts = np.histogram(ms, bins=(0,) + HISTOGRAM_EDGES_MS)[0]
+            summary[name] = {
+                'count': len(ms),
+                'mean_ms': float(ms.mean()),
+                'p50_ms': float(np.percentile(ms, 50)),
+                'p95_ms': float(np.percentile(ms, 95)),
+                'max_ms': float(ms.max()),
+                'histogram': [int(c) for c in counts],
+            }
+        return summary
+
+    def overlay_text(self):
+        """One line per stage, for drawing over the image."""
+        lines = [f"{'stage':<8} {'p50':>6} {'p95':>6} ms"]
+        for name, stats in self.summary().items():
+            lines.append(f"{name:<8} {stats['p50_ms']:>6.2f} {stats['p95_ms']:>6.2f}")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the summary and histograms as JSON, or as CSV for a .csv path."""
+        summary = self.summary()
+        if path.lower().endswith('.csv'):
+            edges = [f"le_{edge:g}ms" for edge in HISTOGRAM_EDGES_MS]
+            with open(path, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['stage', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'max_ms'] + edges)
+                for name, stats in summary.items():
+                    writer.writerow([name, stats['count']]
+                                    + [f"{stats[k]:.4f}" for k in ('mean_ms', 'p50_ms', 'p95_ms', 'max_ms')]
+                                    + stats['histogram'])
+        else:
+            with open(path, 'w') as f:
+                json.dump({'histogram_edges_ms': [str(e) if e == float('inf') else e
+                                                  for e in HISTOGRAM_EDGES_MS],
+                           'window': self.window, 'stages': summary}, f, indent=1)
@@ -0,0 +1,123 @@
+"""
+Strip streaming for rasters too large to load into memory.
+
+Inputs and outputs are uncompressed rasters on disk: NumPy .npy files,
+headerless .raw files (shape given by the caller) and, when tifffile is
+installed, uncompressed .tif/.tiff files. They are opened as RasterFile
+objects, which map only the rows a strip needs, and filtered strip by strip
+through TiledExecutor with halo rows, so peak memory is a small multiple of
+the strip size whatever the size of the raster.
+"""
+import os
+
+import numpy as np
+
+from tiling import TiledExecutor
+
+STREAM_EXTENSIONS = ('.npy', '.raw', '.tif', '.tiff')
+
+
+class RasterFile:
+    """
+    Uncompressed row-major raster on disk, accessed in row strips via np.memmap.
+
+    Indexing with (rows, cols) slices maps just the requested rows; the
+    mapping goes away with the returned array, so resident memory follows
+    the strips in use rather than the file size. Assigning to a slice
+    writes through a short-lived writable mapping. Three-channel rasters
+    stored as RGB (TIFF) are presented in BGR order like cv2.imread.
+    """
+
+    def __init__(self, path, shape, dtype, offset=0, rgb=False):
+        self.path = path
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.offset = offset
+        self.rgb = rgb
+        self.row_bytes = int(np.prod(self.shape[1:])) * self.dtype.itemsize
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def _map(self, rows, mode):
+        start, stop, step = rows.indices(self.shape[0])
+        if step != 1:
+            raise ValueError("RasterFile only supports contiguous row ranges")
+        return np.memmap(self.path, self.dtype, mode, offset=self.offset + start * self.row_bytes,
+                         shape=(stop - start,) + self.shape[1:])
+
+    def __getitem__(self, index):
+        rows, cols = index
+        strip = self._map(rows, 'r')[:, cols]
+        return strip[..., ::-1] if self.rgb else strip
+
+    def __setitem__(self, index, value):
+        rows, cols = index
+        strip = self._map(rows, 'r+')
+        strip[:, cols] = value[..., ::-1] if self.rgb else value
+        del strip
+
+
+def _tifffile():
+    try:
+        import tifffile
+    except ImportError:
+        raise ValueError("streaming TIFF files requires the tifffile package")
+    return tifffile
+
+
+def open_raster(path, raw_shape=None, raw_dtype=np.uint8):
+    """Open a raster for strip reads; .raw files need raw_shape (rows, cols[, channels])."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        array = np.load(path, mmap_mode='r')
+        if not array.flags.c_contiguous:
+            raise ValueError("Fortran-ordered .npy files can't be streamed by rows")
+        return RasterFile(path, array.shape, array.dtype, array.offset)
+    if ext in ('.tif', '.tiff'):
+        # Raises ValueError for compressed or tiled TIFFs, which can't be mapped
+        array = _tifffile().memmap(path, mode='r')
+        return RasterFile(path, array.shape, array.dtype, array.offset, rgb=array.ndim == 3)
+    if ext == '.raw':
+        if raw_shape is None:
+            raise ValueError(".raw input needs its shape (--raw-shape ROWSxCOLS[xCHANNELS])")
+        return RasterFile(path, raw_shape, raw_dtype)
+    raise ValueError(f"can't stream '{ext}' files; use one of {', '.join(STREAM_EXTENSIONS)}")
+
+
+def create_raster(path, shape, dtype=np.uint8):
+    """Create an output raster of the same format as its extension, for strip writes."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.npy':
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=shape)
+    elif ext in ('.tif', '.tiff'):
+        array = _tifffile().memmap(path, shape=shape, dtype=dtype)
+    elif ext == '.raw':
+        array = np.memmap(path, dtype, 'w+', shape=shape)
+    else:
+        raise ValueError(f"can't stream '{ext}' files; use one of {', '.join(STREAM_EXTENSIONS)}")
+    offset = array.offset
+    del array
+    return RasterFile(path, shape, dtype, offset)
+
+
+def stream_filter(processor, src, dst, strip_rows=256, workers=None, raw_shape=None):
+    """
+    Filter the raster at `src` into `dst` in strips of `strip_rows` rows.
+
+    Uses the processor's active filter or chain; filters that need the
+    whole image (Canny, frequency filters) raise ValueError, and so do
+    rasters that aren't 8-bit (the filters and the output are uint8).
+    Returns the output shape.
+    """
+    source = open_raster(src, raw_shape)
+    if source.dtype != np.uint8:
+        raise ValueError(f"can't stream {source.dtype} rasters; convert them to uint8 first")
+    dest = create_raster(dst, source.shape[:2])
+    tiler = TiledExecutor(workers, strip_rows, min_pixels=0, strips=True)
+    try:
+        processor.apply_tiled(source, dest, tiler)
+    finally:
+        tiler.shutdown()
+    return dest.shape
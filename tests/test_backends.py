@@ -0,0 +1,107 @@
+"""
+Every kernel backend against the NumPy backend.
+
+The loop kernels of kernels.py are checked twice: as plain Python (the
+uncompiled loop bodies, so they are covered without numba installed) and,
+when numba is installed, compiled. Results must be identical, except the
+contraharmonic powers, where float rounding may differ in the last bits
+(and the filter by one gray level).
+"""
+import numpy as np
+import pytest
+
+import kernels
+from filters import FilterProcessor
+
+SIZES = [(2, 2), (3, 3), (13, 17), (48, 64)]
+
+# (mode, parameter overrides, largest allowed difference)
+FILTER_CASES = [
+    ('canny', {}, 0),
+    ('canny', {'canny_kernel': 5, 'canny_low_ratio': 20, 'canny_high_ratio': 60}, 0),
+    ('contra_mean', {'contra_Q': 1.5}, 1),
+    ('contra_mean', {'contra_Q': -1.5}, 1),
+    ('midpoint', {'midpoint_kernel': 3}, 0),
+    ('midpoint', {'midpoint_kernel': 99}, 0),
+]
+
+
+@pytest.fixture(params=['python', 'numba'])
+def backend(request):
+    if request.param == 'python':
+        return kernels._loop_backend('python', lambda func, parallel: func)
+    pytest.importorskip('numba')
+    return kernels.get_backend('numba')
+
+
+def gray_frame(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 256, shape, dtype=np.uint8)
+    frame[: shape[0] // 2] //= 4   # a dark half gives Canny real edges
+    return frame
+
+
+@pytest.mark.parametrize('shape', SIZES)
+def test_non_max_suppression(backend, shape):
+    rng = np.random.default_rng(0)
+    mag = rng.random(shape) * 255
+    ang = rng.random(shape) * 180
+    ang.flat[::7] = np.nan
+    mag.flat[::11] = np.nan
+    np.testing.assert_array_equal(backend.non_max_suppression(mag, ang),
+                                  kernels.NUMPY_BACKEND.non_max_suppression(mag, ang))
+
+
+@pytest.mark.parametrize('shape', SIZES)
+def test_hysteresis(backend, shape):
+    rng = np.random.default_rng(1)
+    res = rng.choice(np.array([0, 75, 255], np.uint8), shape, p=[0.5, 0.4, 0.1])
+    np.testing.assert_array_equal(backend.hysteresis(res, 255, 75),
+                                  kernels.NUMPY_BACKEND.hysteresis(res, 255, 75))
+
+
+@pytest.mark.parametrize('shape', SIZES)
+@pytest.mark.parametrize('Q', [1.5, -1.5, 0.0])
+def test_contraharmonic_powers(backend, shape, Q):
+    g = np.random.default_rng(2).integers(1, 256, shape).astype(np.float32)
+    results = []
+    for kernel in (backend, kernels.NUMPY_BACKEND):
+        weighted, powered = g.copy(), np.empty_like(g)
+        kernel.contraharmonic_powers(weighted, Q, powered)
+        results.append((weighted, powered))
+    for got, expected in zip(*results):
+        np.testing.assert_allclose(got, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize('shape', SIZES)
+def test_midpoint(backend, shape):
+    rng = np.random.default_rng(3)
+    low = rng.integers(0, 256, shape, dtype=np.uint8)
+    high = np.maximum(low, rng.integers(0, 256, shape, dtype=np.uint8))
+    high[0, 0], low[0, 0] = 255, 255
+    np.testing.assert_array_equal(backend.midpoint(low.copy(), high, np.empty_like(low)),
+                                  kernels.NUMPY_BACKEND.midpoint(low.copy(), high, np.empty_like(low)))
+
+
+@pytest.mark.parametrize('shape', SIZES[1:])
+@pytest.mark.parametrize('mode,params,tolerance', FILTER_CASES)
+def test_filters(backend, shape, mode, params, tolerance):
+    frame = gray_frame(shape)
+    results = []
+    for kernel in (backend, kernels.NUMPY_BACKEND):
+        processor = FilterProcessor(params, mode)
+        processor.backend = kernel
+        processor.strict = True
+        results.append(processor.apply_filter(frame).astype(np.int16))
+    assert np.abs(results[0] - results[1]).max() <= tolerance
+
+
+def test_get_backend():
+    assert kernels.get_backend('numpy') is kernels.NUMPY_BACKEND
+    expected = 'numba' if kernels.numba is not None else 'numpy'
+    assert kernels.get_backend().name == expected
+    with pytest.raises(ValueError):
+        kernels.get_backend('cuda')
+    if kernels.numba is None:
+        with pytest.raises(ValueError):
+            kernels.get_backend('numba')
@@ -0,0 +1,171 @@
+"""
+Canny's non-maximum suppression and hysteresis against the original loops.
+
+The vectorized versions must reproduce the per-pixel double loops they
+replaced bit for bit, including the single raster-order pass of hysteresis
+(a weak pixel only sees promotions above and to its left).
+"""
+import cv2
+import numpy as np
+import pytest
+
+from filters import FilterProcessor
+from kernels import NUMPY_BACKEND
+
+STRONG, WEAK = 255, 75
+
+
+def loop_non_max_suppression(mag, ang):
+    M, N = mag.shape
+    Z = np.zeros((M, N), dtype=np.float32)
+    for i in range(1, M - 1):
+        for j in range(1, N - 1):
+            angle = ang[i, j]
+            if (0 <= angle < 22.5) or (157.5 <= angle <= 180):
+                q, r = mag[i, j + 1], mag[i, j - 1]
+            elif 22.5 <= angle < 67.5:
+                q, r = mag[i + 1, j - 1], mag[i - 1, j + 1]
+            elif 67.5 <= angle < 112.5:
+                q, r = mag[i + 1, j], mag[i - 1, j]
+            else:
+                q, r = mag[i - 1, j - 1], mag[i + 1, j + 1]
+            if mag[i, j] >= q and mag[i, j] >= r:
+                Z[i, j] = mag[i, j]
+    return Z
+
+
+def loop_hysteresis(res, strong, weak):
+    M, N = res.shape
+    result = res.copy()
+    for i in range(1, M - 1):
+        for j in range(1, N - 1):
+            if result[i, j] == weak:
+                if strong in result[i - 1:i + 2, j - 1:j + 2]:
+                    result[i, j] = strong
+                else:
+                    result[i, j] = 0
+    return result
+
+
+def gradients(gray, ksize):
+    """Normalized magnitude and 0-180 degree angle, as Canny_edge_detection computes them."""
+    blur = cv2.GaussianBlur(gray, (ksize, ksize), 0)
+    gx = cv2.Sobel(blur, cv2.CV_64F, 1, 0, ksize=ksize)
+    gy = cv2.Sobel(blur, cv2.CV_64F, 0, 1, ksize=ksize)
+    mag = np.hypot(gx, gy)
+    with np.errstate(invalid='ignore'):
+        mag = (mag / mag.max()) * 255
+    ang = np.degrees(np.arctan2(gy, gx))
+    ang[ang < 0] += 180
+    return mag, ang
+
+
+def threshold(Z, low, high):
+    res = np.zeros_like(Z, dtype=np.uint8)
+    res[Z >= high] = STRONG
+    res[(Z < high) & (Z >= low)] = WEAK
+    return res
+
+
+def sample_images():
+    """Noise, smoothed noise, shapes with gradients, and a flat image (zero magnitude)."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, (48, 64), dtype=np.uint8)
+    yield 'noise', noise
+    yield 'smooth', cv2.GaussianBlur(noise, (0, 0), 2)
+
+    shapes = np.tile(np.linspace(0, 120, 80, dtype=np.uint8), (60, 1))
+    cv2.circle(shapes, (25, 30), 15, 255, -1)
+    cv2.rectangle(shapes, (45, 10), (70, 40), 40, -1)
+    cv2.line(shapes, (0, 59), (79, 0), 200, 2)
+    yield 'shapes', shapes
+
+    yield 'flat', np.full((20, 30), 128, np.uint8)
+
+
+SAMPLES = list(sample_images())
+
+
+@pytest.mark.parametrize('name,gray', SAMPLES, ids=[name for name, _ in SAMPLES])
+@pytest.mark.parametrize('ksize', [3, 5])
+def test_non_max_suppression_matches_loop(name, gray, ksize):
+    mag, ang = gradients(gray, ksize)
+    np.testing.assert_array_equal(NUMPY_BACKEND.non_max_suppression(mag, ang),
+                                  loop_non_max_suppression(mag, ang))
+
+
+@pytest.mark.parametrize('name,gray', SAMPLES, ids=[name for name, _ in SAMPLES])
+@pytest.mark.parametrize('low,high', [(30, 60), (10, 40), (80, 200)])
+def test_hysteresis_matches_loop(name, gray, low, high):
+    mag, ang = gradients(gray, 3)
+    res = threshold(loop_non_max_suppression(mag, ang), low, high)
+    np.testing.assert_array_equal(NUMPY_BACKEND.hysteresis(res, STRONG, WEAK),
+                                  loop_hysteresis(res, STRONG, WEAK))
+
+
+@pytest.mark.parametrize('name,gray', SAMPLES, ids=[name for name, _ in SAMPLES])
+def test_canny_matches_loop(name, gray):
+    mag, ang = gradients(gray, 3)
+    expected = loop_hysteresis(threshold(loop_non_max_suppression(mag, ang), 30, 60), STRONG, WEAK)
+    with np.errstate(invalid='ignore'):
+        result = FilterProcessor().Canny_edge_detection(gray, 3, 30, 60)
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_non_max_suppression_nan_angles():
+    rng = np.random.default_rng(1)
+    mag = rng.random((30, 40)) * 255
+    ang = rng.random((30, 40)) * 180
+    ang.flat[::5] = np.nan
+    mag.flat[::11] = np.nan
+    np.testing.assert_array_equal(NUMPY_BACKEND.non_max_suppression(mag, ang),
+                                  loop_non_max_suppression(mag, ang))
+
+
+@pytest.mark.parametrize('shape', [(1, 1), (2, 2), (1, 7), (7, 2), (3, 3), (3, 8)])
+def test_small_inputs(shape):
+    rng = np.random.default_rng(sum(shape))
+    mag = rng.random(shape) * 255
+    ang = rng.random(shape) * 180
+    np.testing.assert_array_equal(NUMPY_BACKEND.non_max_suppression(mag, ang),
+                                  loop_non_max_suppression(mag, ang))
+    res = rng.choice(np.array([0, WEAK, STRONG], np.uint8), shape)
+    np.testing.assert_array_equal(NUMPY_BACKEND.hysteresis(res, STRONG, WEAK),
+                                  loop_hysteresis(res, STRONG, WEAK))
+
+
+def long_weak_runs():
+    """Weak runs seeded at either end, in the middle, from above and below, and unseeded."""
+    res = np.zeros((12, 60), np.uint8)
+    res[1, 1:59] = WEAK
+    res[1, 58] = STRONG                  # seed at the right end: only its left neighbour joins
+    res[3, 1:59] = WEAK
+    res[3, 1] = STRONG                   # seed at the left end: spreads to the end
+    res[5, 5:55] = WEAK
+    res[5, 30] = STRONG                  # seed in the middle
+    res[7, 10:50] = WEAK
+    res[6, 40] = STRONG                  # seed in the row above
+    res[9, 10:50] = WEAK
+    res[10, 20] = STRONG                 # seed in the row below
+    res[10, 0:60:7] = WEAK
+    res[:, 0] = WEAK                     # border weak pixels are never visited
+    yield 'rows', res
+
+    snake = np.zeros((20, 20), np.uint8)
+    snake[1:19, 1:19:4] = WEAK
+    snake[1, 1:19] = WEAK
+    snake[18, 1:19] = WEAK
+    snake[18, 18] = STRONG
+    yield 'snake', snake
+    seeded = snake.copy()
+    seeded[1, 1] = STRONG
+    yield 'snake_seed_top', seeded
+
+    rng = np.random.default_rng(2)
+    yield 'dense', rng.choice(np.array([0, WEAK, STRONG], np.uint8), (40, 50), p=[0.2, 0.75, 0.05])
+
+
+@pytest.mark.parametrize('name,res', list(long_weak_runs()), ids=[name for name, _ in long_weak_runs()])
+def test_hysteresis_long_weak_runs(name, res):
+    np.testing.assert_array_equal(NUMPY_BACKEND.hysteresis(res, STRONG, WEAK),
+                                  loop_hysteresis(res, STRONG, WEAK))
@@ -0,0 +1,51 @@
+"""
+Results for a loaded image don't depend on what ran before.
+
+ImageContext shares intermediates between filters and ResultCache memoizes
+results, so a filter must get the same answer whether or not other filters
+(or chains) already filled the context.
+"""
+import cv2
+import numpy as np
+import pytest
+
+from filters import CHAIN_MODE, FILTERS, FilterChain, FilterProcessor, ImageContext
+
+
+def loaded_image():
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (60, 80, 3), dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (0, 0), 1.5)
+
+
+def run(processor, frame, context, mode, stages=None):
+    processor.current_mode = mode
+    if stages is not None:
+        processor.chain = FilterChain()
+        for stage in stages:
+            processor.chain.add(stage, processor.params)
+    return processor.apply_filter(frame, context)
+
+
+@pytest.mark.parametrize('mode', list(FILTERS))
+def test_chain_independent_of_order(mode):
+    frame = loaded_image()
+    expected = run(FilterProcessor(), frame, None, CHAIN_MODE, [mode])
+
+    processor = FilterProcessor()
+    processor.strict = True
+    context = ImageContext(frame)
+    run(processor, frame, context, mode)
+    np.testing.assert_array_equal(run(processor, frame, context, CHAIN_MODE, [mode]), expected)
+
+
+@pytest.mark.parametrize('mode', list(FILTERS))
+def test_filter_independent_of_order(mode):
+    frame = loaded_image()
+    expected = run(FilterProcessor(), frame, None, mode)
+
+    processor = FilterProcessor()
+    processor.strict = True
+    context = ImageContext(frame)
+    run(processor, frame, context, CHAIN_MODE, [mode])
+    np.testing.assert_array_equal(run(processor, frame, context, mode), expected)
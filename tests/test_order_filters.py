@@ -0,0 +1,41 @@
+"""
+Min, max and midpoint against dense erode/dilate, on both sides of MORPH_TABLE_MIN_KERNEL.
+
+Windows from MORPH_TABLE_MIN_KERNEL up only exist in batch and video runs,
+whose --param accepts them past the GUI sliders.
+"""
+import argparse
+
+import cv2
+import numpy as np
+import pytest
+
+from batch import parse_param
+from filters import MORPH_MAX_KERNEL, MORPH_TABLE_MIN_KERNEL, FilterProcessor
+
+KERNELS = [3, 31, MORPH_TABLE_MIN_KERNEL - 2, MORPH_TABLE_MIN_KERNEL, 129, MORPH_MAX_KERNEL]
+
+
+def reference(gray, ksize):
+    kernel = np.ones((ksize, ksize), np.uint8)
+    min_f, max_f = cv2.erode(gray, kernel), cv2.dilate(gray, kernel)
+    return {'min': min_f, 'max': max_f,
+            'midpoint': ((min_f.astype(np.int16) + max_f) // 2).astype(np.uint8)}
+
+
+@pytest.mark.parametrize('shape', [(40, 300), (300, 50), (120, 160)])
+@pytest.mark.parametrize('ksize', KERNELS)
+@pytest.mark.parametrize('mode', ['min', 'max', 'midpoint'])
+def test_matches_dense_kernel(mode, ksize, shape):
+    gray = np.random.default_rng(ksize).integers(0, 256, shape, dtype=np.uint8)
+    name, ksize = parse_param(f'{mode}_kernel={ksize}')
+    processor = FilterProcessor({name: ksize}, mode)
+    processor.strict = True
+    np.testing.assert_array_equal(processor.apply_filter(gray), reference(gray, ksize)[mode])
+
+
+def test_wide_kernels_are_batch_only():
+    assert parse_param(f'max_kernel={MORPH_MAX_KERNEL}') == ('max_kernel', MORPH_MAX_KERNEL)
+    for text in (f'max_kernel={MORPH_MAX_KERNEL + 2}', 'median_kernel=97', 'min_kernel=98'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_param(text)
@@ -0,0 +1,117 @@
+"""
+Tiled and strip-streamed results against the whole image.
+
+Every filter with a halo must give the same result tiled as untiled, for
+tiles much smaller than the image and windows wider than the tiles, and so
+must chains and strip streaming from disk (streaming.stream_filter).
+"""
+import numpy as np
+import pytest
+
+import batch
+from filters import CHAIN_MODE, FILTERS, FilterChain, FilterProcessor
+from streaming import stream_filter
+from tiling import TiledExecutor
+
+HALO_MODES = [mode for mode, spec in FILTERS.items() if spec.halo is not None]
+
+# Overrides on top of the defaults: windows wider than the tiles, and a
+# negative-Q contraharmonic on an image with black pixels
+PARAM_CASES = [
+    {},
+    {'median_kernel': 21, 'min_kernel': 23, 'max_kernel': 23, 'midpoint_kernel': 21,
+     'arith_kernel': 19, 'geo_kernel': 19, 'harm_kernel': 19, 'contra_kernel': 19, 'sobel_kernel': 7},
+    {'contra_Q': -1.5},
+]
+
+CHAINS = [['median', 'max', 'min'], ['geo_mean', 'midpoint'], ['median', 'gradient']]
+
+
+def sample_frame(shape=(70, 90)):
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, shape, dtype=np.uint8)
+    frame[::9, ::7] = 0
+    frame[5:20, 30:60] = 255
+    return frame
+
+
+def processor_for(mode, params, stages=None):
+    processor = FilterProcessor(params, mode)
+    processor.strict = True
+    if stages is not None:
+        processor.chain = FilterChain()
+        for stage in stages:
+            processor.chain.add(stage, processor.params)
+    return processor
+
+
+@pytest.fixture
+def tiler():
+    tiler = TiledExecutor(workers=2, tile_size=16, min_pixels=0)
+    yield tiler
+    tiler.shutdown()
+
+
+def run_both(processor, frame, tiler):
+    with np.errstate(all='ignore'):
+        expected = processor.apply_filter(frame)
+        processor.tiler = tiler
+        return processor.apply_filter(frame), expected
+
+
+@pytest.mark.parametrize('params', PARAM_CASES, ids=['default', 'wide', 'negative_q'])
+@pytest.mark.parametrize('mode', HALO_MODES)
+def test_tiled_matches_whole(mode, params, tiler):
+    tiled, expected = run_both(processor_for(mode, params), sample_frame(), tiler)
+    np.testing.assert_array_equal(tiled, expected)
+
+
+@pytest.mark.parametrize('mode', [mode for mode in HALO_MODES if FILTERS[mode].color])
+def test_tiled_matches_whole_bgr(mode, tiler):
+    frame = np.dstack([sample_frame(), sample_frame()[::-1], sample_frame()[:, ::-1]])
+    processor = processor_for(mode, {})
+    processor.color_mode = 'bgr'
+    tiled, expected = run_both(processor, frame, tiler)
+    np.testing.assert_array_equal(tiled, expected)
+
+
+@pytest.mark.parametrize('stages', CHAINS, ids=[','.join(stages) for stages in CHAINS])
+def test_tiled_chain_matches_whole(stages, tiler):
+    tiled, expected = run_both(processor_for(CHAIN_MODE, {}, stages), sample_frame(), tiler)
+    np.testing.assert_array_equal(tiled, expected)
+
+
+@pytest.mark.parametrize('mode', HALO_MODES)
+def test_stream_matches_whole(mode, tmp_path):
+    frame = sample_frame()
+    np.save(tmp_path / 'in.npy', frame)
+    processor = processor_for(mode, PARAM_CASES[1])
+    with np.errstate(all='ignore'):
+        stream_filter(processor, str(tmp_path / 'in.npy'), str(tmp_path / 'out.npy'), strip_rows=16)
+        expected = processor.apply_filter(frame)
+    np.testing.assert_array_equal(np.load(tmp_path / 'out.npy'), expected)
+
+
+@pytest.mark.parametrize('stages', CHAINS[:2], ids=[','.join(stages) for stages in CHAINS[:2]])
+def test_stream_chain_matches_whole(stages, tmp_path):
+    frame = sample_frame()
+    frame.tofile(tmp_path / 'in.raw')
+    processor = processor_for(CHAIN_MODE, {}, stages)
+    stream_filter(processor, str(tmp_path / 'in.raw'), str(tmp_path / 'out.raw'), strip_rows=16,
+                  raw_shape=frame.shape)
+    result = np.fromfile(tmp_path / 'out.raw', np.uint8).reshape(frame.shape)
+    np.testing.assert_array_equal(result, processor.apply_filter(frame))
+
+
+def test_stream_rejects_non_uint8(tmp_path):
+    np.save(tmp_path / 'in.npy', sample_frame().astype(np.uint16) * 100)
+    with pytest.raises(ValueError, match='uint16'):
+        stream_filter(processor_for('median', {}), str(tmp_path / 'in.npy'), str(tmp_path / 'out.npy'))
+    assert not (tmp_path / 'out.npy').exists()
+
+
+@pytest.mark.parametrize('filters', ['canny', 'median,gradient'])
+def test_stream_rejects_untileable_filters(filters, tmp_path):
+    with pytest.raises(SystemExit) as exit_info:
+        batch.main([str(tmp_path), str(tmp_path / 'out'), '--filter', filters, '--stream'])
+    assert exit_info.value.code == 2
@@ -0,0 +1,99 @@
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+class TiledExecutor:
+    """
+    Runs a per-pixel filter over overlapping tiles on a thread pool.
+
+    The image is cut into `tile_size` squares, each read with a halo of
+    `halo` extra pixels on every side that lies inside the image. Every
+    output pixel therefore sees exactly the neighbourhood it would see in
+    the whole image, including OpenCV's border handling at the image edges,
+    and the cropped tile cores are written straight into one output array.
+    OpenCV and NumPy release the GIL, so tiles run in parallel, and filter
+    temporaries scale with the tile size times the worker count instead of
+    the image size.
+
+    Only images of at least `min_pixels` are tiled; FilterProcessor runs
+    smaller frames whole. With strips=True tiles span the full width and
+    `tile_size` is the strip height, which reads row-major rasters on disk
+    sequentially (see streaming.py). Any array-like that supports `shape`
+    and (rows, cols) slicing can be the image, and `out`.
+    """
+
+    def __init__(self, workers=None, tile_size=1024, min_pixels=8_000_000, strips=False):
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_size = tile_size
+        self.min_pixels = min_pixels
+        self.strips = strips
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def worth_tiling(self, image):
+        return image.shape[0] * image.shape[1] >= self.min_pixels
+
+    def tiles(self, shape, halo):
+        """Yield (core, padded) slice pairs covering an image of `shape`."""
+        rows, cols = shape[:2]
+        width = cols if self.strips else self.tile_size
+        for top in range(0, rows, self.tile_size):
+            bottom = min(top + self.tile_size, rows)
+            for left in range(0, cols, width):
+                right = min(left + width, cols)
+                core = (slice(top, bottom), slice(left, right))
+                padded = (slice(max(top - halo, 0), min(bottom + halo, rows)),
+                          slice(max(left - halo, 0), min(right + halo, cols)))
+                yield core, padded
+
+    def map(self, func, image, halo, out=None):
+        """
+        Apply `func(tile)` to every padded tile and stitch the cropped cores.
+
+        `func` must return an array with the tile's rows and columns. Unless
+        `out` is given, the output takes its dtype and channel count from
+        the first tile.
+        """
+
+        def run(core, padded):
+            return core, func(image[padded])[_crop(core, padded)]
+
+        for core, result in self._run(run, image, halo):
+            if out is None:
+                out = np.empty(image.shape[:2] + result.shape[2:], result.dtype)
+            out[core] = result
+        return out
+
+    def peak(self, func, image, halo):
+        """Largest value of `func(tile)` over the tile cores (for global normalization)."""
+        def run(core, padded):
+            return func(image[padded])[_crop(core, padded)].max()
+
+        return max(self._run(run, image, halo))
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _run(self, run, image, halo):
+        """Yield run(core, padded) per tile, in order, with a bounded number in flight."""
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix='tile')
+        pending = deque()
+        for core, padded in self.tiles(image.shape, halo):
+            pending.append(self._pool.submit(run, core, padded))
+            if len(pending) >= self.workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _crop(core, padded):
+    """Slices of the core region inside a padded tile."""
+    return tuple(slice(c.start - p.start, c.stop - p.start) for c, p in zip(core, padded))